@@ -108,11 +108,11 @@ ${chalk.grey('——————————————————')}`
 
       outro(stdout);
 
-      const remotes = await getGitRemotes();
-
       // user isn't pushing, return early
       if (config.OCO_GITPUSH === false) return;
 
+      const remotes = await getGitRemotes();
+
       if (!remotes.length) {
         const { stdout } = await execa('git', ['push']);
         if (stdout) outro(stdout);
@@ -63,13 +63,16 @@ def cli(language, log_level):
 @click.option("--stage-all", "-a", is_flag=True, help="Stage all changes before commit")
 @click.option("--skip-confirm", is_flag=True, help="Skip commit confirmation")
 @click.option("--context", "-c", help="Additional context for the AI")
+@click.option(
+    "--stream", is_flag=True, help="Print the message as it is generated"
+)
 @click.option(
     "--log-level",
     type=click.Choice(["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]),
     help="Set the logging level",
 )
 @click.argument("extra_args", nargs=-1)
-def commit(stage_all, skip_confirm, context, log_level, extra_args):
+def commit(stage_all, skip_confirm, context, stream, log_level, extra_args):
     """Generate an AI commit message from your staged changes."""
     # Configure logging if specified at command level
     import logging
@@ -102,6 +105,7 @@ def commit(stage_all, skip_confirm, context, log_level, extra_args):
             context or "",
             stage_all_str,
             skip_confirm_str,
+            stream=stream,
         )
     except TypeError as e:
         console.print(
@@ -149,6 +153,7 @@ def config(mode, key, project, log_level, value):
       OCO_PROMPT_MODULE               Prompt module (conventional-commit, @commitlint)
       OCO_ONE_LINE_COMMIT             Use one-line commits (true/false)
       OCO_OMIT_SCOPE                  Omit scope in commit message (true/false)
+      OCO_MINIMAL_PROMPT_THRESHOLD    Diff size in bytes below which a short prompt is used (default: 512)
 
     Examples:
       oco config get                   # Get all configuration values
@@ -3,13 +3,13 @@ Enhanced commit command for OpenCommit Python CLI.
 Provides AI-generated commit messages using LiteLLM.
 """
 
+import asyncio
 import re
 import sys
 import logging
-from typing import List, Optional, Dict, Union
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
 import click
-import litellm
 import subprocess
 from rich.console import Console
 from rich.panel import Panel
@@ -26,12 +26,17 @@ from py_opencommit.i18n import get_text
 from py_opencommit.commands.config import get_config, ConfigKeys
 
 from py_opencommit.utils.git import (
+    DIFF_TRUNCATED_MARKER,
     get_staged_diff,
+    get_staged_files,
+    get_status_files,
+    has_staged_changes,
     stage_all_changes,
+    stage_all_if_needed,
     is_git_repository,
     stage_files,
 )
-from py_opencommit.utils.token_count import token_count
+from py_opencommit.utils.token_count import decode, encode, token_count, token_count_batch
 
 logger = logging.getLogger("opencommit")
 # Initialize rich console
@@ -46,12 +51,55 @@ MODEL_CONTEXT_LIMIT = int(config.get(ConfigKeys.OCO_TOKENS_MAX_INPUT, 40960))
 MAX_OUTPUT_TOKENS = int(config.get(ConfigKeys.OCO_TOKENS_MAX_OUTPUT, 1024)) # Increased default output tokens
 MAX_INPUT_TOKENS_PER_CHUNK = int(MODEL_CONTEXT_LIMIT * 0.75) # Reserve 25% for prompt and response
 
+# Diff parsing patterns, compiled once at import
+# Paths with unusual characters are quoted by git, e.g. diff --git "a/\303\251" "b/\303\251"
+DIFF_GIT_RE = re.compile(r'^diff --git "?a/(.*)"? "?b/(.*?)"?$', re.MULTILINE)
+HUNK_HEADER_RE = re.compile(r"^@@.*?@@.*?$", re.MULTILINE)
+
+# Tokens reserved for the "# ... (truncated)" marker appended to cut diffs
+TRUNCATION_MARKER_TOKENS = 16
+
+# Smallest chunk a context-window retry will re-split a diff chunk into
+MIN_RETRY_CHUNK_TOKENS = 256
+
+# Upper bound on concurrent LLM requests when a diff is split into chunks
+MAX_CONCURRENT_REQUESTS = 4
+
+# Upper bound on how much of the staged diff is read from git
+MAX_DIFF_BYTES = 1024 * 1024
+
+# Strings accepted as true for boolean options passed through as text
+_TRUTHY = frozenset({"true", "yes", "1", "y"})
+
 MODEL_NAME = config.get(ConfigKeys.OCO_MODEL, "gpt-4o-mini") # Use a potentially faster/cheaper default
 DEFAULT_TEMPLATE_PLACEHOLDER = config.get(
     ConfigKeys.OCO_MESSAGE_TEMPLATE_PLACEHOLDER, "$msg" # Match TS placeholder
 )
 
 
+# Instructions for merging per-chunk messages into one; built once at import
+SUMMARY_SYSTEM_PROMPT = """You are a commit message summarizer. Create a concise summary of these individual commit messages, following the conventional commit format.
+
+IMPORTANT: Your summary MUST follow the format: <type>(<scope>): <subject>
+
+The scope MUST contain the primary filename(s) relevant to the summarized changes.
+If the summary covers changes in multiple files, list the most relevant ones comma-separated in the scope (e.g., `file1.py, file2.ts`). Limit to 2-3 key files if many were changed.
+If the summary primarily concerns one file, use that filename (e.g., `main.py`).
+
+Examples of good summaries with filename scopes:
+- feat(auth.py): implement OAuth2 authentication
+- refactor(utils.py): improve code organization and readability
+- fix(api_handler.ts): resolve validation issues
+- docs(README.md): update installation instructions
+
+For multiple files with related changes, use comma-separated filenames:
+- refactor(cli.py, config.py): update command structure and improve error handling
+- feat(data_processor.py, pipeline.py): add new data processing pipeline
+
+NEVER generate a commit message without a scope in parentheses containing relevant filename(s)."""
+SUMMARY_USER_PREFIX = "Summarize these related commit messages into one cohesive message following the conventional commit format with proper scopes:\n\n"
+
+
 def extract_file_names_from_diff(diff: str) -> List[str]:
     """
     Extract file names from a git diff.
@@ -87,43 +135,26 @@ def extract_file_names_from_diff(diff: str) -> List[str]:
         return file_names
 
 
-def get_staged_files() -> List[str]:
+def iter_file_diffs(diff: str) -> Iterator[Tuple[str, str]]:
     """
-    Get a list of staged files.
-
-    Returns:
-        List of staged file paths
-    """
-    try:
-        result = subprocess.run(
-            ["git", "diff", "--cached", "--name-only"],
-            capture_output=True,
-            text=True,
-            check=True,
-        )
-        return [f for f in result.stdout.strip().split("\n") if f]
-    except subprocess.CalledProcessError as e:
-        raise RuntimeError(f"Failed to get staged files: {e}")
+    Lazily yield the per-file sections of a git diff.
 
+    Args:
+        diff: Full git diff
 
-def get_unstaged_files() -> List[str]:
+    Yields:
+        (file path, file diff) pairs in diff order
     """
-    Get a list of unstaged files.
+    headers = DIFF_GIT_RE.finditer(diff)
+    current = next(headers, None)
 
-    Returns:
-        List of unstaged file paths
-    """
-    try:
-        result = subprocess.run(
-            ["git", "diff", "--name-only"],
-            capture_output=True,
-            text=True,
-            check=True,
-        )
-        return [f for f in result.stdout.strip().split("\n") if f]
-    except subprocess.CalledProcessError as e:
-        logger.error(f"Failed to get unstaged files: {e}")
-        return []
+    # Slice the diff between successive headers instead of splitting it into lines
+    while current is not None:
+        following = next(headers, None)
+        # Drop the newline that precedes the next header
+        end = following.start() - 1 if following is not None else len(diff)
+        yield current.group(2), diff[current.start():end]
+        current = following
 
 
 def split_diff_by_files(diff: str) -> Dict[str, str]:
@@ -136,28 +167,24 @@ def split_diff_by_files(diff: str) -> Dict[str, str]:
     Returns:
         Dictionary mapping file paths to their diffs
     """
-    file_diffs = {}
-    current_file = None
-    current_diff = []
+    return dict(iter_file_diffs(diff))
 
-    for line in diff.split("\n"):
-        if line.startswith("diff --git"):
-            if current_file and current_diff:
-                file_diffs[current_file] = "\n".join(current_diff)
 
-            # Extract filename from diff header
-            match = re.search(r"diff --git a/(.*) b/(.*)", line)
-            if match:
-                current_file = match.group(2)
-                current_diff = [line]
-        elif current_file:
-            current_diff.append(line)
+def staged_files_from_diff(diff: str) -> List[str]:
+    """
+    Get the staged file paths named in a staged diff's headers.
 
-    # Add the last file
-    if current_file and current_diff:
-        file_diffs[current_file] = "\n".join(current_diff)
+    Falls back to asking git when the diff was truncated and may be missing files.
 
-    return file_diffs
+    Args:
+        diff: Staged git diff
+
+    Returns:
+        List of staged file paths
+    """
+    if diff.endswith(DIFF_TRUNCATED_MARKER):
+        return get_staged_files()
+    return [file_path for file_path, _ in iter_file_diffs(diff)]
 
 
 def chunk_diff(diff: str, max_tokens_per_chunk: int = MAX_INPUT_TOKENS_PER_CHUNK) -> List[str]:
@@ -174,66 +201,70 @@ def chunk_diff(diff: str, max_tokens_per_chunk: int = MAX_INPUT_TOKENS_PER_CHUNK
     if not diff:
         return []
 
+    # A cl100k token is never shorter than one byte, so a diff with no more
+    # bytes than the limit fits without running the tokenizer at all
+    if len(diff.encode("utf-8")) <= max_tokens_per_chunk:
+        return [diff]
+
     # If diff is small enough, return as is
     diff_tokens = token_count(diff)
     if diff_tokens <= max_tokens_per_chunk:
         return [diff]
 
     # Log the token counts if logging is enabled
-    if not logger.disabled:
-        logger.debug(f"Diff is {diff_tokens} tokens, exceeding chunk limit of {max_tokens_per_chunk}")
-        logger.debug(f"Model context limit: {MODEL_CONTEXT_LIMIT}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Diff is %s tokens, exceeding chunk limit of %s", diff_tokens, max_tokens_per_chunk)
+        logger.debug("Model context limit: %s", MODEL_CONTEXT_LIMIT)
 
-    # Split by files first
-    file_diffs = split_diff_by_files(diff)
+    # Split by files first. Later pieces of a file that was split by hunks
+    # carry no file header; treat such a diff as one file so it is split by hunks too
+    file_diffs = split_diff_by_files(diff) or {"(continued hunks)": diff}
     chunks = []
-    current_chunk = ""
+    # Parts of the chunk being built, joined with newlines when it is flushed
+    current_parts = []
     current_tokens = 0
 
-    for file_path, file_diff in file_diffs.items():
-        file_tokens = token_count(file_diff)
+    # Tokenize every file diff in one batch up front
+    file_token_counts = token_count_batch(list(file_diffs.values()))
+
+    for (file_path, file_diff), file_tokens in zip(file_diffs.items(), file_token_counts):
 
         # If a single file diff is too large, split it by hunks or truncate
         if file_tokens > max_tokens_per_chunk:
             # Try to split by hunks (git diff sections starting with @@ markers)
-            hunks = re.split(r'(^@@.*?@@.*?$)', file_diff, flags=re.MULTILINE)
+            hunk_starts = [match.start() for match in HUNK_HEADER_RE.finditer(file_diff)]
 
             # If we have hunks, process them individually
-            if len(hunks) > 1:
-                # Recombine the split markers with their content
-                processed_hunks = []
-                for i in range(0, len(hunks)-1, 2):
-                    if i+1 < len(hunks):
-                        processed_hunks.append(hunks[i] + hunks[i+1])
-                    else:
-                        processed_hunks.append(hunks[i])
+            if hunk_starts:
+                # Slice between hunk headers; the file header stays with the first hunk
+                hunk_starts[0] = 0
+                hunk_ends = [start - 1 for start in hunk_starts[1:]] + [len(file_diff)]
+                hunks = [file_diff[start:end] for start, end in zip(hunk_starts, hunk_ends)]
 
                 # Process each hunk
-                for hunk in processed_hunks:
-                    hunk_tokens = token_count(hunk)
+                hunk_token_counts = token_count_batch(hunks)
+                for hunk, hunk_tokens in zip(hunks, hunk_token_counts):
 
                     # If hunk is still too large, truncate it
                     if hunk_tokens > max_tokens_per_chunk:
-                        truncation_ratio = max_tokens_per_chunk / hunk_tokens
-                        truncated_hunk = hunk[:int(len(hunk) * truncation_ratio * 0.9)] # Truncate slightly more to be safe
-                        truncated_hunk += "\n# ... (hunk truncated)"
-                        hunk = truncated_hunk
-                        hunk_tokens = token_count(hunk)
+                        # Cut at a token boundary, leaving room for the marker
+                        tokens = encode(hunk)[:max_tokens_per_chunk - TRUNCATION_MARKER_TOKENS]
+                        hunk = decode(tokens) + "\n# ... (hunk truncated)"
+                        hunk_tokens = len(tokens) + TRUNCATION_MARKER_TOKENS
 
                     # Add hunk to chunks
-                    if current_tokens + hunk_tokens > max_tokens_per_chunk and current_chunk:
-                        chunks.append(current_chunk)
-                        current_chunk = hunk
+                    if current_tokens + hunk_tokens > max_tokens_per_chunk and current_parts:
+                        chunks.append("\n".join(current_parts))
+                        current_parts = [hunk]
                         current_tokens = hunk_tokens
                     else:
-                        if current_chunk:
-                            current_chunk += "\n"
-                        current_chunk += hunk
+                        current_parts.append(hunk)
                         current_tokens += hunk_tokens
             else:
                 # No hunks found, truncate the file diff
-                truncation_ratio = max_tokens_per_chunk / file_tokens
-                truncated_diff = file_diff[:int(len(file_diff) * truncation_ratio * 0.9)] # Truncate slightly more
+                # Cut at a token boundary, leaving room for the marker
+                tokens = encode(file_diff)[:max_tokens_per_chunk - TRUNCATION_MARKER_TOKENS]
+                truncated_diff = decode(tokens)
                 console.print(
                     f"[yellow]Warning:[/yellow] Diff for {file_path} is too large ({file_tokens} tokens), truncating to ~{max_tokens_per_chunk} tokens..."
                 )
@@ -244,24 +275,23 @@ def chunk_diff(diff: str, max_tokens_per_chunk: int = MAX_INPUT_TOKENS_PER_CHUNK
                     chunks.append(truncated_diff)
         else:
             # If adding this file would exceed the limit, start a new chunk
-            if current_tokens + file_tokens > max_tokens_per_chunk and current_chunk:
-                chunks.append(current_chunk)
-                current_chunk = file_diff
+            if current_tokens + file_tokens > max_tokens_per_chunk and current_parts:
+                chunks.append("\n".join(current_parts))
+                current_parts = [file_diff]
                 current_tokens = file_tokens
             else:
-                if current_chunk:
-                    current_chunk += "\n"
-                current_chunk += file_diff
+                current_parts.append(file_diff)
                 current_tokens += file_tokens
 
     # Add the final chunk
+    current_chunk = "\n".join(current_parts)
     if current_chunk.strip():
         chunks.append(current_chunk)
 
     return chunks
 
 
-def create_commit_prompt(diff: str, context: str = "") -> List[Dict[str, str]]:
+def create_commit_prompt(diff: str, context: str = "") -> List[Dict[str, Any]]:
     """
     Create a well-engineered prompt for commit message generation.
 
@@ -270,63 +300,243 @@ def create_commit_prompt(diff: str, context: str = "") -> List[Dict[str, str]]:
         context: Additional context
 
     Returns:
-        List of messages for the LLM, or raises ImportError if commitlint module not found.
+        List of messages for the LLM; a system message's content may be a list
+        of content blocks. Raises ImportError if commitlint module not found.
     """
-    # Calculate approximate token count for the diff
-    diff_tokens = token_count(diff)
-
-    # Log token count if logging is enabled
-    if not logger.disabled:
-        logger.debug(f"Diff token count: {diff_tokens}")
-    
-    # Extract file names from diff for better scoping
-    file_names = extract_file_names_from_diff(diff)
-    
-    # Get appropriate scope for these files
-    try:
-        from py_opencommit.modules.commitlint.prompts import get_scope_for_files
-        scope = get_scope_for_files(file_names)
-    except ImportError:
-        # Simple fallback if import fails
-        scope = "unknown"
-        if len(file_names) <= 3:
-            scope = ", ".join(file_names)
+    # Log token count if logging is enabled; the diff is only tokenized for this
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Diff token count: %s", token_count(diff))
     
     # Use the commitlint prompts. If it fails, raise the error.
     try:
         # Ensure the import happens here to catch potential issues
         from py_opencommit.modules.commitlint.prompts import create_commit_prompt as create_commitlint_prompt_func
-        if not logger.disabled:
+        if logger.isEnabledFor(logging.DEBUG):
             logger.debug("Using commitlint prompts for commit message generation")
         return create_commitlint_prompt_func(diff, context)
     except ImportError as e:
         console.print("[bold red]Error:[/bold red] Failed to load commitlint prompt module.")
         console.print("Please ensure the necessary modules are installed and accessible.")
-        logger.error(f"ImportError loading commitlint prompts: {e}")
+        logger.error("ImportError loading commitlint prompts: %s", e)
         raise e # Re-raise the error to stop execution
 
 
-def generate_commit_message(diff: str, context: str = "") -> str:
+def _base_completion_kwargs() -> Dict:
+    """
+    Build the request-independent part of the litellm completion kwargs.
+
+    Returns:
+        Completion kwargs for every request, without messages
+    """
+    # Get API key from config
+    api_key = config.get(ConfigKeys.OCO_API_KEY)
+    api_base = config.get(ConfigKeys.OCO_API_URL)
+
+    # Configure litellm with API key if available
+    completion_kwargs = {
+        "model": MODEL_NAME,
+        "temperature": 0.7,
+        "max_tokens": MAX_OUTPUT_TOKENS, # Use increased token limit
+    }
+
+    if api_key:
+        completion_kwargs["api_key"] = api_key
+    if api_base:
+        completion_kwargs["api_base"] = api_base
+
+    # Convert any top-level boolean values in the kwargs
+    completion_kwargs = _sanitize_scalars(completion_kwargs)
+
+    # Ensure temperature is a float and max_tokens an int
+    completion_kwargs["temperature"] = float(completion_kwargs["temperature"])
+    completion_kwargs["max_tokens"] = int(completion_kwargs["max_tokens"])
+
+    return completion_kwargs
+
+
+def _log_completion_kwargs(completion_kwargs: Dict, label: str) -> None:
+    """
+    Log completion kwargs and their types at DEBUG level.
+    
+    Args:
+        completion_kwargs: Keyword arguments for the litellm call
+        label: Which request the kwargs belong to
+    """
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+
+    logger.debug("Argument types before litellm completion (%s):", label)
+    for key, value in completion_kwargs.items():
+        # Special handling for messages list
+        if key == 'messages' and isinstance(value, list):
+            logger.debug("  - %s: list", key)
+            for idx, msg in enumerate(value):
+                logger.debug("    - message[%s]: %s", idx, type(msg))
+                if isinstance(msg, dict):
+                    for msg_key, msg_val in msg.items():
+                        logger.debug("      - %s: %s", msg_key, type(msg_val))
+        else:
+            logger.debug("  - %s: %s", key, type(value))
+    logger.debug("Final completion kwargs (%s): %s", label, completion_kwargs)
+
+
+def _is_context_length_error(error: Exception) -> bool:
+    """Check whether an LLM error was caused by exceeding the context window."""
+    error_str = str(error).lower()
+    return "context length" in error_str or "context window" in error_str
+
+
+def _call_litellm(messages: List[Dict], label: str) -> str:
+    """
+    Run a blocking completion for the given messages.
+    
+    Args:
+        messages: Prompt messages
+        label: Which request this is, for debug logging
+        
+    Returns:
+        The stripped completion text
+    """
+    # Imported lazily: litellm dominates CLI startup time
+    import litellm
+
+    completion_kwargs = {**_base_completion_kwargs(), "messages": messages}
+    _log_completion_kwargs(completion_kwargs, label)
+    response = litellm.completion(**completion_kwargs)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("LiteLLM response (%s): %s", label, response)
+    return response.choices[0].message.content.strip()
+
+
+async def _acall_litellm(messages: List[Dict], base_kwargs: Dict, label: str) -> str:
+    """
+    Run a completion for the given messages without blocking the event loop.
+    
+    Args:
+        messages: Prompt messages
+        base_kwargs: Shared completion kwargs from _base_completion_kwargs
+        label: Which request this is, for debug logging
+        
+    Returns:
+        The stripped completion text
+    """
+    import litellm
+
+    completion_kwargs = {**base_kwargs, "messages": messages}
+    _log_completion_kwargs(completion_kwargs, label)
+    response = await litellm.acompletion(**completion_kwargs)
+    return response.choices[0].message.content.strip()
+
+
+async def _generate_chunk_messages(
+    diff_chunks: List[str], context: str, progress: Progress, task
+) -> List[str]:
+    """
+    Generate a commit message for each diff chunk, running the requests concurrently.
+    
+    Args:
+        diff_chunks: Diff chunks to describe
+        context: Additional context
+        progress: Progress bar advanced as each chunk finishes
+        task: Progress task to advance
+        
+    Returns:
+        Generated messages, in chunk order
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    # Shared by every chunk; each request only swaps in its own messages
+    base_kwargs = _base_completion_kwargs()
+
+    async def describe(chunk: str, label: str) -> str:
+        prompt = create_commit_prompt(chunk, context)
+        try:
+            return await _acall_litellm(prompt, base_kwargs, label)
+        except Exception as e:
+            chunk_tokens = token_count(chunk)
+            if not _is_context_length_error(e) or chunk_tokens <= MIN_RETRY_CHUNK_TOKENS:
+                raise
+            # Re-split the chunk at hunk boundaries into pieces half its size
+            console.print(f"[yellow]Warning: Context window exceeded. Trying with smaller chunks...[/yellow]")
+            smaller_limit = max(MIN_RETRY_CHUNK_TOKENS, chunk_tokens // 2)
+            sub_chunks = chunk_diff(chunk, max_tokens_per_chunk=smaller_limit)
+            if not sub_chunks or sub_chunks == [chunk]:
+                # Nothing to split on; send a shortened chunk rather than dropping it
+                tokens = encode(chunk)[:smaller_limit - TRUNCATION_MARKER_TOKENS]
+                sub_chunks = [decode(tokens) + "\n# ... (chunk truncated)"]
+            sub_messages = [await describe(sub_chunk, label) for sub_chunk in sub_chunks]
+            return "\n\n".join(sub_messages)
+
+    async def generate(i: int, chunk: str) -> str:
+        try:
+            async with semaphore:
+                message = await describe(chunk, f"chunk {i+1}")
+        except Exception as e:
+            raise RuntimeError(
+                f"Error generating message for chunk {i+1}: {str(e)}"
+            )
+
+        progress.update(task, advance=1)
+        return message
+
+    return list(await asyncio.gather(
+        *(generate(i, chunk) for i, chunk in enumerate(diff_chunks))
+    ))
+
+
+def _stream_completion(messages: List[Dict]) -> str:
+    """
+    Run a streaming completion, echoing tokens to the console as they arrive.
+    
+    Args:
+        messages: Prompt messages
+        
+    Returns:
+        The full completion text
+    """
+    import litellm
+
+    completion_kwargs = {**_base_completion_kwargs(), "messages": messages}
+    _log_completion_kwargs(completion_kwargs, "streamed")
+
+    parts = []
+    for chunk in litellm.completion(**completion_kwargs, stream=True):
+        delta = chunk.choices[0].delta.content
+        if delta:
+            parts.append(delta)
+            console.print(delta, end="", style="dim", markup=False, highlight=False)
+    console.print()
+    return "".join(parts).strip()
+
+
+def generate_commit_message(
+    diff: str,
+    context: str = "",
+    staged_files: Optional[List[str]] = None,
+    stream: bool = False,
+) -> str:
     """
     Generate a commit message using LiteLLM.
     
     Args:
         diff: Git diff
         context: Additional context
+        staged_files: Staged file paths, if the caller already has them
+        stream: Print the message as it is generated (single-chunk diffs only)
         
     Returns:
         Generated commit message
     """
-    if not logger.disabled:
+    if logger.isEnabledFor(logging.DEBUG):
         logger.debug("Generating commit message")
         
     if not diff.strip():
         raise ValueError("No changes to commit. The diff is empty.")
 
     # Get the list of staged files for better scoping
-    staged_files = get_staged_files()
-    if not logger.disabled:
-        logger.debug(f"Staged files: {staged_files}")
+    if staged_files is None:
+        staged_files = staged_files_from_diff(diff)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Staged files: %s", staged_files)
     
     # Add staged files to context if not already provided
     if context and not any(file in context for file in staged_files):
@@ -339,114 +549,22 @@ def generate_commit_message(diff: str, context: str = "") -> str:
     if not diff_chunks:
         raise ValueError("Failed to process the diff. Please check your changes.")
 
-    if not logger.disabled:
-        logger.debug(f"Split diff into {len(diff_chunks)} chunks")
+    # Tokenizing every chunk just for logging is only worth it at DEBUG level
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Split diff into %s chunks", len(diff_chunks))
         for i, chunk in enumerate(diff_chunks):
-            logger.debug(f"Chunk {i+1} token count: {token_count(chunk)}")
+            logger.debug("Chunk %s token count: %s", i + 1, token_count(chunk))
 
     # For multiple chunks, generate and combine messages
     if len(diff_chunks) > 1:
-        messages = []
         with Progress() as progress:
             task = progress.add_task(
                 f"[cyan]{get_text('generatingCommitMessage')}...",
                 total=len(diff_chunks),
             )
-
-            for i, chunk in enumerate(diff_chunks):
-                progress.update(
-                    task,
-                    description=f"[cyan]Processing chunk {i+1}/{len(diff_chunks)}...",
-                )
-                
-                # Create prompt for this chunk
-                prompt = create_commit_prompt(chunk, context)
-                
-                try:
-                    # Get API key from config
-                    api_key = config.get(ConfigKeys.OCO_API_KEY)
-                    api_base = config.get(ConfigKeys.OCO_API_URL)
-
-                    # Configure litellm with API key if available
-                    completion_kwargs = {
-                        "model": MODEL_NAME,
-                        "messages": prompt,
-                        "temperature": 0.7,
-                        "max_tokens": MAX_OUTPUT_TOKENS, # Use increased token limit
-                    }
-
-                    if api_key:
-                        completion_kwargs["api_key"] = api_key
-                    if api_base:
-                        completion_kwargs["api_base"] = api_base
-    
-                    # Convert any boolean values in the kwargs (including nested structures)
-                    completion_kwargs = convert_bools_to_strings(completion_kwargs)
-
-                    # Ensure temperature is a float
-                    if "temperature" in completion_kwargs:
-                        completion_kwargs["temperature"] = float(
-                            completion_kwargs["temperature"]
-                        )
-
-                    # Ensure max_tokens is an int
-                    if "max_tokens" in completion_kwargs:
-                        completion_kwargs["max_tokens"] = int(
-                            completion_kwargs["max_tokens"]
-                        )
-
-                    # Log types before calling litellm if logging is enabled
-                    if not logger.disabled:
-                        logger.debug("Argument types before litellm.completion (chunk loop):")
-                        for key, value in completion_kwargs.items():
-                            # Special handling for messages list
-                            if key == 'messages' and isinstance(value, list):
-                                logger.debug(f"  - {key}: list")
-                                for idx, msg in enumerate(value):
-                                    logger.debug(f"    - message[{idx}]: {type(msg)}")
-                                    if isinstance(msg, dict):
-                                        for msg_key, msg_val in msg.items():
-                                            logger.debug(f"      - {msg_key}: {type(msg_val)}")
-                            else:
-                                logger.debug(f"  - {key}: {type(value)}")
-
-                    if not logger.disabled:
-                        logger.debug(
-                            f"Chunk {i} final completion kwargs: {completion_kwargs}"
-                        )
-                        
-                    # Add error handling for context window exceeded
-                    try:
-                        response = litellm.completion(**completion_kwargs)
-                        chunk_message = response.choices[0].message.content.strip()
-                        messages.append(chunk_message)
-                        progress.update(task, advance=1)
-                    except Exception as e:
-                        error_str = str(e)
-                        if "context length" in error_str.lower() or "context window" in error_str.lower():
-                            # Try with a smaller chunk
-                            console.print(f"[yellow]Warning: Context window exceeded. Trying with a smaller chunk...[/yellow]")
-                            # Reduce chunk size by half and try again
-                            half_length = len(chunk) // 2
-                            smaller_chunk = chunk[:half_length] + "\n# ... (truncated)"
-                            
-                            # Update prompt with smaller chunk
-                            smaller_prompt = create_commit_prompt(smaller_chunk, context)
-                            completion_kwargs["messages"] = smaller_prompt
-                            
-                            # Try again with smaller chunk
-                            response = litellm.completion(**completion_kwargs)
-                            chunk_message = response.choices[0].message.content.strip()
-                            messages.append(chunk_message)
-                            progress.update(task, advance=1)
-                        else:
-                            # Re-raise other errors
-                            raise
-                except Exception as e:
-                    progress.stop()
-                    raise RuntimeError(
-                        f"Error generating message for chunk {i+1}: {str(e)}"
-                    )
+            messages = asyncio.run(
+                _generate_chunk_messages(diff_chunks, context, progress, task)
+            )
 
         # Combine messages
         combined = "\n\n".join(messages)
@@ -454,92 +572,19 @@ def generate_commit_message(diff: str, context: str = "") -> str:
         if len(messages) > 1:
             console.print(f"[cyan]Generated {len(messages)} partial messages. Attempting to summarize...[/cyan]")
             try:
-                # Get the list of staged files for the summary context
-                staged_files = get_staged_files()
-                
-                # Just use the list of files directly
-                staged_files_str = ", ".join(staged_files)
-                
                 summary_prompt = [
                     {
                         "role": "system",
-                        "content": f"""You are a commit message summarizer. Create a concise summary of these individual commit messages, following the conventional commit format.
-
-IMPORTANT: Your summary MUST follow the format: <type>(<scope>): <subject>
-
-The scope MUST contain the primary filename(s) relevant to the summarized changes.
-If the summary covers changes in multiple files, list the most relevant ones comma-separated in the scope (e.g., `file1.py, file2.ts`). Limit to 2-3 key files if many were changed.
-If the summary primarily concerns one file, use that filename (e.g., `main.py`).
-The full list of files changed in this commit is: {staged_files_str}
-
-Examples of good summaries with filename scopes:
-- feat(auth.py): implement OAuth2 authentication
-- refactor(utils.py): improve code organization and readability
-- fix(api_handler.ts): resolve validation issues
-- docs(README.md): update installation instructions
-
-For multiple files with related changes, use comma-separated filenames:
-- refactor(cli.py, config.py): update command structure and improve error handling
-- feat(data_processor.py, pipeline.py): add new data processing pipeline
-
-NEVER generate a commit message without a scope in parentheses containing relevant filename(s).""",
+                        # The changed files go last so the fixed instructions stay a stable prefix
+                        "content": f"{SUMMARY_SYSTEM_PROMPT}\n\nThe full list of files changed in this commit is: {', '.join(staged_files)}",
                     },
                     {
                         "role": "user",
-                        "content": f"Summarize these related commit messages into one cohesive message following the conventional commit format with proper scopes:\n\n{combined}",
+                        "content": SUMMARY_USER_PREFIX + combined,
                     },
                 ]
     
-                # Create completion kwargs
-                summary_completion_kwargs = {
-                    "model": MODEL_NAME,
-                    "messages": summary_prompt,
-                    "temperature": 0.7,
-                    "max_tokens": MAX_OUTPUT_TOKENS, # Use increased token limit for summary too
-                }
-
-                # Get API key from config
-                api_key = config.get(ConfigKeys.OCO_API_KEY)
-                api_base = config.get(ConfigKeys.OCO_API_URL)
-
-                if api_key:
-                    summary_completion_kwargs["api_key"] = api_key
-                if api_base:
-                    summary_completion_kwargs["api_base"] = api_base
-                    
-                # Convert any boolean values in the kwargs (including nested structures)
-                summary_completion_kwargs = convert_bools_to_strings(summary_completion_kwargs)
-    
-                # Ensure temperature is a float
-                if "temperature" in summary_completion_kwargs:
-                    summary_completion_kwargs["temperature"] = float(
-                        summary_completion_kwargs["temperature"]
-                    )
-    
-                # Ensure max_tokens is an int
-                if "max_tokens" in summary_completion_kwargs:
-                    summary_completion_kwargs["max_tokens"] = int(
-                        summary_completion_kwargs["max_tokens"]
-                    )
-    
-                # Log types before calling litellm if logging is enabled
-                if not logger.disabled:
-                    logger.debug("Argument types before litellm.completion (summary):")
-                    for key, value in summary_completion_kwargs.items():
-                        # Special handling for messages list
-                        if key == 'messages' and isinstance(value, list):
-                            logger.debug(f"  - {key}: list")
-                            for idx, msg in enumerate(value):
-                                logger.debug(f"    - message[{idx}]: {type(msg)}")
-                                if isinstance(msg, dict):
-                                    for msg_key, msg_val in msg.items():
-                                        logger.debug(f"      - {msg_key}: {type(msg_val)}")
-                        else:
-                            logger.debug(f"  - {key}: {type(value)}")
-    
-                    logger.debug(f"Summary completion kwargs: {summary_completion_kwargs}")
-                response = litellm.completion(**summary_completion_kwargs)
-                summary_message = response.choices[0].message.content.strip()
+                summary_message = _call_litellm(summary_prompt, "summary")
                 console.print("[green]Successfully summarized commit message.[/green]")
                 return summary_message
             except Exception as e:
@@ -555,82 +600,18 @@ NEVER generate a commit message without a scope in parentheses containing releva
     # For single chunks, generate directly
     prompt = create_commit_prompt(diff_chunks[0], context) # This now raises ImportError if module not found
     try:
-        with Progress() as progress:
-            task = progress.add_task(
-                f"[cyan]{get_text('generatingCommitMessage')}...", total=1
-            )
-
-            # Get API key from config
-            api_key = config.get(ConfigKeys.OCO_API_KEY)
-            api_base = config.get(ConfigKeys.OCO_API_URL)
-
-            if not logger.disabled:
-                logger.debug(f"Using model: {MODEL_NAME}")
-                logger.debug(f"API base URL: {api_base}")
-                logger.debug(f"API key present: {bool(api_key)}")
-
-            # Configure litellm with API key if available
-            completion_kwargs = {
-                "model": MODEL_NAME,
-                "messages": prompt,
-                "temperature": 0.7,
-                "max_tokens": MAX_OUTPUT_TOKENS, # Use increased token limit
-            }
-
-            if api_key:
-                completion_kwargs["api_key"] = api_key
-            if api_base:
-                completion_kwargs["api_base"] = api_base
-    
-            # Debug the messages after conversion if logging is enabled
-            if not logger.disabled:
-                logger.debug("Messages after conversion:")
-                for i, msg in enumerate(completion_kwargs["messages"]):
-                    logger.debug(f"Message {i}: {msg}")
-
-            # Make sure all values in the completion_kwargs are properly typed (including nested structures)
-            if not logger.disabled:
-                logger.debug("Converting any boolean values to strings in completion_kwargs")
-            completion_kwargs = convert_bools_to_strings(completion_kwargs)
-    
-            if not logger.disabled:
-                logger.debug(f"Completion kwargs: {completion_kwargs}")
-    
-            # Ensure temperature is a float
-            if "temperature" in completion_kwargs:
-                completion_kwargs["temperature"] = float(
-                    completion_kwargs["temperature"]
+        if stream:
+            message = _stream_completion(prompt)
+        else:
+            with Progress() as progress:
+                task = progress.add_task(
+                    f"[cyan]{get_text('generatingCommitMessage')}...", total=1
                 )
+                message = _call_litellm(prompt, "single chunk")
+                progress.update(task, advance=1)
 
-            # Ensure max_tokens is an int
-            if "max_tokens" in completion_kwargs:
-                completion_kwargs["max_tokens"] = int(completion_kwargs["max_tokens"])
-
-            # Log types before calling litellm if logging is enabled
-            if not logger.disabled:
-                logger.debug("Argument types before litellm.completion (single chunk):")
-                for key, value in completion_kwargs.items():
-                    # Special handling for messages list
-                    if key == 'messages' and isinstance(value, list):
-                        logger.debug(f"  - {key}: list")
-                        for idx, msg in enumerate(value):
-                            logger.debug(f"    - message[{idx}]: {type(msg)}")
-                            if isinstance(msg, dict):
-                                for msg_key, msg_val in msg.items():
-                                    logger.debug(f"      - {msg_key}: {type(msg_val)}")
-                    else:
-                        logger.debug(f"  - {key}: {type(value)}")
-
-            if not logger.disabled:
-                logger.debug(f"Final completion kwargs: {completion_kwargs}")
-            response = litellm.completion(**completion_kwargs)
-            if not logger.disabled:
-                logger.debug(f"LiteLLM response: {response}")
-            progress.update(task, advance=1)
-
-        message = response.choices[0].message.content.strip()
-        if not logger.disabled:
-            logger.debug(f"Generated message: {message}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Generated message: %s", message)
         return message
     except Exception as e:
         raise RuntimeError(f"Failed to generate commit message: {str(e)}")
@@ -655,38 +636,38 @@ def check_message_template(
     return None
 
 
-def convert_bools_to_strings(obj):
+def _sanitize_scalars(kwargs: Dict) -> Dict:
     """
-    Recursively convert all boolean values to strings in a nested structure.
+    Convert top-level boolean values in completion kwargs to strings.
+
+    Nested values aren't walked, so the (bool-free) messages list is passed
+    through untouched.
 
     Args:
-        obj: The object to convert (dict, list, etc.)
+        kwargs: Completion keyword arguments
 
     Returns:
-        The object with all booleans converted to strings
-    """
-    if isinstance(obj, dict):
-        result = {}
-        for key, value in obj.items():
-            if isinstance(value, bool):
-                result[key] = str(value).lower()
-            elif isinstance(value, (dict, list)):
-                result[key] = convert_bools_to_strings(value)
-            else:
-                result[key] = value
-        return result
-    elif isinstance(obj, list):
-        result = []
-        for item in obj:
-            if isinstance(item, bool):
-                result.append(str(item).lower())
-            elif isinstance(item, (dict, list)):
-                result.append(convert_bools_to_strings(item))
-            else:
-                result.append(item)
-        return result
-    else:
-        return obj
+        A copy of kwargs with booleans converted to strings
+    """
+    return {
+        key: str(value).lower() if isinstance(value, bool) else value
+        for key, value in kwargs.items()
+    }
+
+
+def _coerce_bool(value: Union[bool, str]) -> bool:
+    """
+    Interpret a boolean option that may have been passed as a string.
+
+    Args:
+        value: A bool, or a string such as "true" or "no"
+
+    Returns:
+        The value as a bool
+    """
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in _TRUTHY
 
 
 def strip_backticks(message: str) -> str:
@@ -755,41 +736,36 @@ def run_git_commit(message: str, extra_args: List[str]) -> bool:
     # Clean the message by removing any backticks
     clean_message = strip_backticks(message)
     
-    # Prepare the commit command
-    cmd = ["git", "commit", "-m", clean_message] + filtered_args
+    # Pass the message on stdin rather than argv: no size limit, not visible in ps
+    cmd = ["git", "commit", "-F", "-"] + filtered_args
 
-    logger.debug(f"Running git commit command: {cmd}")
+    logger.debug("Running git commit command: %s", cmd)
 
     try:
-        result = subprocess.run(cmd, check=True)
-        logger.debug(f"Git commit result: {result}")
+        result = subprocess.run(cmd, input=clean_message.encode("utf-8"), check=True)
+        logger.debug("Git commit result: %s", result)
         return True  # If we get here, the command succeeded
     except subprocess.CalledProcessError as e:
-        logger.error(f"Git commit failed: {e}")
+        logger.error("Git commit failed: %s", e)
         raise RuntimeError(f"Git commit failed: {e}")
 
 
-@click.command()
-@click.argument("extra_args", nargs=-1)
-@click.option("--context", "-c", default="", help="Additional context for the AI")
-@click.option(
-    "--stage-all", "-a", is_flag=True, help="Stage all changes before committing"
-)
-@click.option("--skip-confirm", is_flag=True, help="Skip commit confirmation")
 def commit(
     extra_args: List[str] = None,
     context: str = "",
     stage_all: Union[bool, str] = False,
     skip_confirm: Union[bool, str] = False,
+    stream: bool = False,
 ) -> None:
     """Generate an AI commit message from your staged changes."""
     if extra_args is None:
         extra_args = []
     # Output for test compatibility
     click.echo("Running commit command with LiteLLM integration")
-    if not logger.disabled:
+    if logger.isEnabledFor(logging.DEBUG):
         logger.debug(
-            f"commit() called with: extra_args={extra_args}, context={context}, stage_all={stage_all}, skip_confirm={skip_confirm}"
+            "commit() called with: extra_args=%s, context=%s, stage_all=%s, skip_confirm=%s",
+            extra_args, context, stage_all, skip_confirm,
         )
 
     try:
@@ -802,23 +778,26 @@ def commit(
 
         # Stage all changes if requested
         # Convert stage_all to boolean if it's a string
-        stage_all_bool = stage_all if isinstance(stage_all, bool) else stage_all.lower() in ('true', 'yes', '1', 'y')
+        stage_all_bool = _coerce_bool(stage_all)
         if stage_all_bool:
             console.print("Staging all changes...")
-            stage_all_changes()
-
-        # Get the diff of staged changes
-        diff = get_staged_diff()
-
-        # Get staged, unstaged, and untracked files
-        staged_files = get_staged_files()
-        unstaged_files = get_unstaged_files()
-        # Import the new function
-        from py_opencommit.utils.git import get_untracked_files
-        untracked_files = get_untracked_files()
+            stage_all_if_needed()
+
+        # A single `git diff --cached --quiet` tells us whether anything is
+        # staged; only then pay for fetching the diff and file names
+        if has_staged_changes():
+            diff = get_staged_diff(MAX_DIFF_BYTES)
+            staged_files = staged_files_from_diff(diff)
+            untracked_files = []
+            changes_not_staged = []
+        else:
+            diff = ""
+            staged_files = []
+            # One `git status` call lists both unstaged and untracked files
+            _, unstaged_files, untracked_files = get_status_files()
 
-        # Combine unstaged and untracked files
-        changes_not_staged = sorted(list(set(unstaged_files + untracked_files)))
+            # Combine unstaged and untracked files
+            changes_not_staged = sorted(list(set(unstaged_files + untracked_files)))
 
         # If no staged files but we have unstaged or untracked changes
         if not staged_files and changes_not_staged:
@@ -836,8 +815,8 @@ def commit(
                 console.print("Staging all changes...")
                 stage_all_changes()
                 # Get the diff again after staging
-                diff = get_staged_diff()
-                staged_files = get_staged_files()
+                diff = get_staged_diff(MAX_DIFF_BYTES)
+                staged_files = staged_files_from_diff(diff)
             else:
                 # Let user select specific files to stage
                 if len(changes_not_staged) > 0:
@@ -865,8 +844,8 @@ def commit(
                         stage_files(files_to_stage)
                         
                         # Get the diff again after staging
-                        diff = get_staged_diff()
-                        staged_files = get_staged_files()
+                        diff = get_staged_diff(MAX_DIFF_BYTES)
+                        staged_files = staged_files_from_diff(diff)
                     else:
                         console.print("[yellow]No files selected for staging. Exiting.[/yellow]")
                         sys.exit(0)
@@ -878,15 +857,14 @@ def commit(
             )
             sys.exit(0)
 
-        # Get staged files for display
-        staged_files = get_staged_files()
+        # Display staged files
         console.print(f"[green]Found {len(staged_files)} staged files:[/green]")
         for file in staged_files:
             console.print(f"  - {file}")
 
         # Generate commit message
         try:
-            message = generate_commit_message(diff, context)
+            message = generate_commit_message(diff, context, staged_files, stream=stream)
         except Exception as e:
             console.print(
                 f"[bold red]Error generating commit message:[/bold red] {str(e)}"
@@ -911,7 +889,7 @@ def commit(
 
         # Confirm and commit
         # Convert skip_confirm to boolean if it's a string
-        skip_confirm_bool = skip_confirm if isinstance(skip_confirm, bool) else skip_confirm.lower() in ('true', 'yes', '1', 'y')
+        skip_confirm_bool = _coerce_bool(skip_confirm)
         if not skip_confirm_bool:
             # Default to Yes for confirmation
             confirmed = Confirm.ask(get_text("confirmCommit"), default=True)
@@ -921,10 +899,10 @@ def commit(
 
         # Execute git commit
         try:
-            logger.debug(f"About to run git commit with message: {message}")
-            logger.debug(f"Extra args: {extra_args}")
+            logger.debug("About to run git commit with message (first 200 chars): %.200s", message)
+            logger.debug("Extra args: %s", extra_args)
             success = run_git_commit(message, list(extra_args))
-            logger.debug(f"Git commit result: {success}")
+            logger.debug("Git commit result: %s", success)
             console.print(f"[bold green]✓ {get_text('commitSuccess')}![/bold green]")
         except Exception as e:
             logger.exception("Failed to commit changes")
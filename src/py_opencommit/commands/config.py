@@ -12,6 +12,9 @@ from rich.console import Console
 console = Console()
 logger = logging.getLogger("opencommit")
 
+# Parsed config files keyed on path, each stored with the (mtime_ns, size) it was read at
+_CONFIG_CACHE: Dict[str, Any] = {}
+
 T = TypeVar('T')
 
 
@@ -32,6 +35,7 @@ class ConfigKeys(str, Enum):
     OCO_ONE_LINE_COMMIT = 'OCO_ONE_LINE_COMMIT'
     OCO_TEST_MOCK_TYPE = 'OCO_TEST_MOCK_TYPE'
     OCO_OMIT_SCOPE = 'OCO_OMIT_SCOPE'
+    OCO_MINIMAL_PROMPT_THRESHOLD = 'OCO_MINIMAL_PROMPT_THRESHOLD'
     OCO_GITPUSH = 'OCO_GITPUSH'  # deprecated
 
 
@@ -381,6 +385,7 @@ config_validators = {
     ConfigKeys.OCO_ONE_LINE_COMMIT: lambda v, _=None: validate_boolean(ConfigKeys.OCO_ONE_LINE_COMMIT, v),
     ConfigKeys.OCO_TEST_MOCK_TYPE: lambda v, _=None: validate_test_mock_type(v),
     ConfigKeys.OCO_WHY: lambda v, _=None: validate_boolean(ConfigKeys.OCO_WHY, v),
+    ConfigKeys.OCO_MINIMAL_PROMPT_THRESHOLD: lambda v, _=None: validate_integer(ConfigKeys.OCO_MINIMAL_PROMPT_THRESHOLD, v),
 }
 
 
@@ -399,6 +404,7 @@ DEFAULT_CONFIG = {
     ConfigKeys.OCO_TEST_MOCK_TYPE: 'commit-message',
     ConfigKeys.OCO_WHY: False,
     ConfigKeys.OCO_OMIT_SCOPE: False,
+    ConfigKeys.OCO_MINIMAL_PROMPT_THRESHOLD: 512,
     ConfigKeys.OCO_GITPUSH: True  # deprecated
 }
 
@@ -443,65 +449,43 @@ def parse_config_value(value: Any) -> Any:
         return value
 
 
-def get_global_config() -> Dict[str, Any]:
-    """Get the global configuration."""
-    config_path = get_global_config_path()
-    if not config_path.exists():
-        return DEFAULT_CONFIG.copy()
+def _read_config_cached(path: Path, parse: Callable[[Path], Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Parse a config file, reusing the last result while its mtime and size are unchanged.
     
-    try:
-        # First try to read as INI file with configparser
-        try:
-            config_file = config_path.read_text(encoding='utf-8')
-            config_parser = configparser.ConfigParser()
-            config_parser.read_string(config_file)
-            
-            # Extract values
-            result = {}
-            if 'DEFAULT' in config_parser:
-                for key, value in config_parser['DEFAULT'].items():
-                    if key.upper() in ConfigKeys.__members__:
-                        result[key.upper()] = parse_config_value(value)
-            
-            return result
-        except configparser.MissingSectionHeaderError:
-            # If no section headers, read as key=value pairs like .env
-            result = {}
-            with open(config_path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if not line or line.startswith('#'):
-                        continue
-                    
-                    if '=' in line:
-                        key, value = line.split('=', 1)
-                        key = key.strip()
-                        value = value.strip()
-                        
-                        # Remove quotes if present
-                        if value.startswith('"') and value.endswith('"'):
-                            value = value[1:-1]
-                        elif value.startswith("'") and value.endswith("'"):
-                            value = value[1:-1]
-                        
-                        if key.upper() in ConfigKeys.__members__:
-                            result[key.upper()] = parse_config_value(value)
-            
-            return result
-    except Exception as e:
-        logger.error(f"Error reading global config: {e}")
-        return DEFAULT_CONFIG.copy()
+    Returns a copy so callers can modify it without touching the cache.
+    """
+    stat = path.stat()
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = _CONFIG_CACHE.get(str(path))
+    if cached is not None and cached[0] == stamp:
+        return dict(cached[1])
 
+    result = parse(path)
+    _CONFIG_CACHE[str(path)] = (stamp, result)
+    return dict(result)
 
-def get_project_config() -> Dict[str, Any]:
-    """Get the project configuration from .env file."""
-    project_config_path = get_project_config_path()
-    if not project_config_path:
-        return {}
-    
+
+def _parse_global_config(config_path: Path) -> Dict[str, Any]:
+    """Parse the global config file, either INI or key=value format."""
+    # First try to read as INI file with configparser
     try:
-        env_config = {}
-        with open(project_config_path, 'r', encoding='utf-8') as f:
+        config_file = config_path.read_text(encoding='utf-8')
+        config_parser = configparser.ConfigParser()
+        config_parser.read_string(config_file)
+        
+        # Extract values
+        result = {}
+        if 'DEFAULT' in config_parser:
+            for key, value in config_parser['DEFAULT'].items():
+                if key.upper() in ConfigKeys.__members__:
+                    result[key.upper()] = parse_config_value(value)
+        
+        return result
+    except configparser.MissingSectionHeaderError:
+        # If no section headers, read as key=value pairs like .env
+        result = {}
+        with open(config_path, 'r', encoding='utf-8') as f:
             for line in f:
                 line = line.strip()
                 if not line or line.startswith('#'):
@@ -519,9 +503,58 @@ def get_project_config() -> Dict[str, Any]:
                         value = value[1:-1]
                     
                     if key.upper() in ConfigKeys.__members__:
-                        env_config[key.upper()] = parse_config_value(value)
+                        result[key.upper()] = parse_config_value(value)
         
-        return env_config
+        return result
+
+
+def get_global_config() -> Dict[str, Any]:
+    """Get the global configuration."""
+    config_path = get_global_config_path()
+    if not config_path.exists():
+        return DEFAULT_CONFIG.copy()
+    
+    try:
+        return _read_config_cached(config_path, _parse_global_config)
+    except Exception as e:
+        logger.error(f"Error reading global config: {e}")
+        return DEFAULT_CONFIG.copy()
+
+
+def _parse_project_config(project_config_path: Path) -> Dict[str, Any]:
+    """Parse a project .env file."""
+    env_config = {}
+    with open(project_config_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            
+            if '=' in line:
+                key, value = line.split('=', 1)
+                key = key.strip()
+                value = value.strip()
+                
+                # Remove quotes if present
+                if value.startswith('"') and value.endswith('"'):
+                    value = value[1:-1]
+                elif value.startswith("'") and value.endswith("'"):
+                    value = value[1:-1]
+                
+                if key.upper() in ConfigKeys.__members__:
+                    env_config[key.upper()] = parse_config_value(value)
+    
+    return env_config
+
+
+def get_project_config() -> Dict[str, Any]:
+    """Get the project configuration from .env file."""
+    project_config_path = get_project_config_path()
+    if not project_config_path:
+        return {}
+    
+    try:
+        return _read_config_cached(project_config_path, _parse_project_config)
     except Exception as e:
         logger.error(f"Error reading project config: {e}")
         return {}
@@ -600,6 +633,7 @@ def get_config() -> Dict[str, Any]:
 def set_global_config(key: str, value: str) -> None:
     """Set a configuration value in the global config file."""
     config_path = get_global_config_path()
+    _CONFIG_CACHE.pop(str(config_path), None)
     
     # Check if file exists and determine its format
     use_ini_format = True
@@ -676,6 +710,7 @@ def set_global_config(key: str, value: str) -> None:
 def set_project_config(key: str, value: str) -> None:
     """Set a configuration value in the project .env file."""
     env_path = Path.cwd() / '.env'
+    _CONFIG_CACHE.pop(str(env_path), None)
     
     # Read existing .env
     env_lines = []
@@ -1,66 +1,50 @@
+import functools
+import hashlib
 import os
-import stat
 import sys
-import platform
+from importlib.resources import files
 from pathlib import Path
 
-from py_opencommit.config import get_config
 from py_opencommit.i18n import get_text
 from rich.console import Console
 
 console = Console()
 
-# Define the hook content as a constant
-HOOK_CONTENT = """#!/usr/bin/env python3
-# PyOC Git Hook
-# This hook is installed by py-opencommit
 
-import sys
-import subprocess
-import os
+# prepare-commit-msg script installed by githook(), shipped as package data
+_HOOK_TEMPLATE = "prepare-commit-msg.py.tmpl"
+
+# rwxr-xr-x, so the hook also runs for other users of a shared checkout
+HOOK_MODE = 0o755
+
 
-# Get the commit message file path from the arguments
-commit_msg_file = sys.argv[1]
-
-# Read the current commit message
-with open(commit_msg_file, 'r') as f:
-    commit_msg = f.read()
-
-# Skip for merge commits
-if commit_msg.startswith('Merge'):
-    sys.exit(0)
-
-# Skip if environment variable is set
-if os.environ.get('SKIP_OC'):
-    sys.exit(0)
-
-try:
-    # Run oco command
-    result = subprocess.run(['oco', 'commit', '--skip-confirmation'], 
-                          capture_output=True, text=True, check=True)
-    
-    # Get the output
-    commit_msg = result.stdout.strip()
-    
-    # Write the new commit message
-    with open(commit_msg_file, 'w') as f:
-        f.write(commit_msg)
-        
-except subprocess.CalledProcessError as e:
-    print(f"Error running oco: {e.stderr}")
-    sys.exit(1)
-except Exception as e:
-    print(f"Error: {str(e)}")
-    sys.exit(1)
-"""
+@functools.lru_cache(maxsize=1)
+def load_hook_content():
+    """Read the prepare-commit-msg hook script shipped with the package."""
+    return files("py_opencommit.commands").joinpath(_HOOK_TEMPLATE).read_text(encoding="utf-8")
+
+
+@functools.lru_cache(maxsize=1)
+def _hook_digest():
+    """Digest of the hook script, used to skip reinstalling an up-to-date hook."""
+    return hashlib.sha256(load_hook_content().encode()).digest()
+
+
+def _hook_is_current(hook_path):
+    """Check whether the installed hook matches the packaged one and is executable."""
+    try:
+        existing = hook_path.read_bytes()
+    except OSError:
+        return False
+    return (
+        hashlib.sha256(existing).digest() == _hook_digest()
+        and bool(hook_path.stat().st_mode & 0o111)
+    )
 
 
 def get_git_root():
     """Get the root directory of the git repository."""
-    git_dir = Path(".git")
-    if git_dir.exists():
-        return os.getcwd()
-    return None
+    return "." if os.path.isdir(".git") else None
 
 
 def githook():
@@ -79,18 +63,20 @@ def githook():
 
         # Create the hook file
         hook_path = hooks_dir / "prepare-commit-msg"
-        with open(hook_path, "w") as f:
-            f.write(HOOK_CONTENT)
-
-        # Set executable permissions
-        # Handle platform-specific permission settings
-        if platform.system() == 'Windows':
-            # On Windows, we need to ensure the file has the executable bit set
-            # S_IEXEC is a combination of S_IXUSR, S_IXGRP, S_IXOTH
-            os.chmod(hook_path, os.stat(hook_path).st_mode | stat.S_IEXEC | stat.S_IREAD | stat.S_IWRITE)
-        else:
-            # On Unix-like systems, set explicit executable permissions
-            os.chmod(hook_path, os.stat(hook_path).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH | stat.S_IREAD | stat.S_IWRITE)
+        if _hook_is_current(hook_path):
+            console.print("[bold green]Success:[/bold green] Git hook is already up to date!")
+            return True
+
+        # Write the hook next to its final location and rename it into place,
+        # so an interrupted install never leaves a truncated hook behind
+        tmp_path = hook_path.with_suffix(".tmp")
+        try:
+            tmp_path.write_bytes(load_hook_content().encode())
+            os.chmod(tmp_path, HOOK_MODE)
+            os.replace(tmp_path, hook_path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
 
         console.print("[bold green]Success:[/bold green] Git hook installed successfully!")
         return True
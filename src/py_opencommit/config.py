@@ -4,30 +4,48 @@ import json
 import os
 from pathlib import Path
 
+# Parsed config cache, keyed on the config file's (mtime_ns, size)
+_CACHE = {"stamp": None, "data": None}
+
+
+def get_config_dir():
+    """Get the config directory without creating it."""
+    return Path.home() / ".config" / "py-opencommit"
+
 
 def get_config_path():
     """Get the path to the config file."""
-    config_dir = Path.home() / ".config" / "py-opencommit"
+    config_dir = get_config_dir()
     config_dir.mkdir(parents=True, exist_ok=True)
     return config_dir / "config.json"
 
 
 def get_config():
     """Get the configuration."""
-    config_path = get_config_path()
-    if not config_path.exists():
+    config_path = get_config_dir() / "config.json"
+    try:
+        st = os.stat(config_path)
+    except OSError:
         return {}
-    
+
+    stamp = (st.st_mtime_ns, st.st_size)
+    if _CACHE["stamp"] == stamp:
+        return dict(_CACHE["data"])
+
     try:
-        with open(config_path, "r") as f:
-            return json.load(f)
-    except Exception:
+        data = json.loads(config_path.read_bytes())
+    except (OSError, UnicodeDecodeError, json.JSONDecodeError):
         return {}
 
+    _CACHE["stamp"] = stamp
+    _CACHE["data"] = data
+    # Hand out a copy so callers can't modify the cached config
+    return dict(data)
+
 
 def save_config(config):
     """Save the configuration."""
     config_path = get_config_path()
-    with open(config_path, "w") as f:
-        json.dump(config, f, indent=2)
-    return config
\ No newline at end of file
+    config_path.write_text(json.dumps(config, indent=2))
+    _CACHE["stamp"] = None
+    return config
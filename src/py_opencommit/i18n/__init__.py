@@ -1,79 +1,81 @@
+import functools
 import json
 import os
 from pathlib import Path
+from types import MappingProxyType
 
-# Global variable to store translations
-_translations = {}
+# Directory holding the <language>.json translation files
+_I18N_DIR = Path(__file__).parent
+
+# Language used when get_text isn't given one and PYOC_LANGUAGE isn't set
 _current_language = "en"
 
+# Language aliases accepted by get_language_from_alias
+_ALIAS_MAP = MappingProxyType({
+    "en": "en",
+    "english": "en",
+    "eng": "en",
+    "es": "es",
+    "spanish": "es",
+    "español": "es",
+    "espanol": "es",
+    # Add more aliases as needed
+})
 
-def load_translations(language="en"):
+
+@functools.lru_cache(maxsize=8)
+def _load(language):
     """
-    Load translations for the specified language.
+    Read and parse the translation file for a language.
     """
-    global _translations, _current_language
-    
-    if language in _translations:
-        _current_language = language
-        return _translations[language]
-    
+    # Construct the path to the language file
+    lang_file = _I18N_DIR / f"{language}.json"
+
+    # If the language file doesn't exist, fall back to English
+    if not lang_file.exists() and language != "en":
+        print(f"Language file for '{language}' not found, falling back to English.")
+        return _load("en")
+
     try:
-        # Get the directory where this file is located
-        i18n_dir = Path(__file__).parent
-        
-        # Construct the path to the language file
-        lang_file = i18n_dir / f"{language}.json"
-        
-        # If the language file doesn't exist, fall back to English
-        if not lang_file.exists() and language != "en":
-            print(f"Language file for '{language}' not found, falling back to English.")
-            return load_translations("en")
-        
-        # Load the language file
-        with open(lang_file, "r", encoding="utf-8") as f:
-            translations = json.load(f)
-            _translations[language] = translations
-            _current_language = language
-            return translations
-    except Exception as e:
+        return json.loads(lang_file.read_bytes())
+    except (OSError, json.JSONDecodeError) as e:
         print(f"Error loading translations: {str(e)}")
         # Return an empty dict as fallback
         return {}
 
 
+def set_language(language):
+    """
+    Set the language get_text uses when none is given.
+    """
+    global _current_language
+
+    _current_language = language
+
+
+def load_translations(language="en"):
+    """
+    Load translations for the specified language and make it the current one.
+    """
+    set_language(language)
+    return _load(language)
+
+
 def get_text(key, language=None):
     """
     Get the translated text for the specified key.
-    If language is not specified, use the current language.
+    If language is not specified, use PYOC_LANGUAGE if set, otherwise the
+    current language.
     """
     if language is None:
-        # Use environment variable if set, otherwise use current language
         language = os.environ.get("PYOC_LANGUAGE", _current_language)
-    
-    # Load translations if not already loaded
-    if language not in _translations:
-        load_translations(language)
-    
-    # Get the translation
-    translation = _translations.get(language, {})
-    
+
     # Return the translated text or the key itself if not found
-    return translation.get(key, key)
+    return _load(language).get(key, key)
 
 
 def get_language_from_alias(alias):
     """
     Get the language code from an alias.
     """
-    alias_map = {
-        "en": "en",
-        "english": "en",
-        "eng": "en",
-        "es": "es",
-        "spanish": "es",
-        "español": "es",
-        "espanol": "es",
-        # Add more aliases as needed
-    }
-    
-    return alias_map.get(alias.lower(), None)
+    return _ALIAS_MAP.get(alias.lower())
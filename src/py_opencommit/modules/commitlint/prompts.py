@@ -1,12 +1,15 @@
 """Prompt templates for commitlint integration."""
 
+import functools
 import logging
 import os
 import json
-from typing import Dict, List, Any, Tuple, Optional, Union
+import re
+from typing import Dict, List, Any, NamedTuple, Tuple, Optional, Union
 
 from ...commands.config import get_config, ConfigKeys
 from ...i18n import get_text
+from ...utils.token_count import token_count
 
 logger = logging.getLogger("opencommit")
 
@@ -14,9 +17,83 @@ logger = logging.getLogger("opencommit")
 config = get_config()
 language = config.get(ConfigKeys.OCO_LANGUAGE, "en")
 
+# Whether to send cache_control breakpoints, which only Anthropic models accept
+CACHE_CONTROL = (
+    config.get(ConfigKeys.OCO_AI_PROVIDER) == "anthropic"
+    or str(config.get(ConfigKeys.OCO_MODEL, "")).startswith(("claude", "anthropic/"))
+)
+
+
+class PromptConfig(NamedTuple):
+    """Config flags that shape the commit prompts."""
+    omit_scope: bool
+    use_emoji: bool
+    add_description: bool
+    add_why: bool
+    one_line_commit: bool
+
+
+# Prompt flags, resolved once alongside the rest of the module's config
+PROMPT_CONFIG = PromptConfig(
+    omit_scope=config.get(ConfigKeys.OCO_OMIT_SCOPE, False),
+    use_emoji=config.get(ConfigKeys.OCO_EMOJI, False),
+    add_description=config.get(ConfigKeys.OCO_DESCRIPTION, True),  # Default to True for better messages
+    add_why=config.get(ConfigKeys.OCO_WHY, True),  # Default to True for better messages
+    one_line_commit=config.get(ConfigKeys.OCO_ONE_LINE_COMMIT, False),
+)
+
+# Diffs smaller than this many bytes, touching at most one file, get a compact prompt
+MINIMAL_PROMPT_THRESHOLD = int(config.get(ConfigKeys.OCO_MINIMAL_PROMPT_THRESHOLD, 512))
+
 # System identity prompt
 IDENTITY = "You are an AI assistant specialized in generating high-quality git commit messages."
 
+# Git diff file header; captures the 'b' file name up to the first whitespace
+DIFF_HEADER_RE = re.compile(r"^diff --git a/.*? b/(\S*)", re.MULTILINE)
+
+# Conventional commit format rules with detailed examples, closing the static system prompt
+_FORMAT_RULES_TMPL = """
+Your commit message MUST follow the conventional commit format.
+
+Structure:
+{structure_of_commit}
+
+Header Rules:
+- Type: Must be lowercase. Choose from: feat, fix, docs, style, refactor, perf, test, build, ci, chore, revert.
+- Scope: {scope_rule}
+- Subject: Concise description of the change in imperative mood (e.g., 'add', 'fix', 'update'). Do not end with a period. Keep the header line under 72 characters.
+
+Body/Footer Rules (only if OCO_DESCRIPTION=true):
+- Separate header from body with a blank line.
+- Explain WHAT changed and WHY for *all* changes.
+- Keep lines under 72 characters.
+
+IMPORTANT: If the provided diff contains multiple distinct logical changes (e.g., a refactoring AND a new feature, or documentation updates AND a bug fix), you MUST generate a separate conventional commit header line for EACH distinct change. Follow each header line with its corresponding description if OCO_DESCRIPTION is true, or list all headers first followed by a combined description.
+
+Examples (assuming OCO_OMIT_SCOPE=false):
+
+Single Change (Single File):
+feat(auth.py): implement OAuth2 authentication flow
+
+Add OAuth2 authentication support with Google and GitHub providers.
+This improves security by using industry-standard protocols and allows users
+to log in with existing accounts, reducing onboarding friction.
+
+Multiple Distinct Changes (Multiple Files):
+refactor(auth.py, user.py): simplify login logic and database schema
+
+Streamline the authentication process and update user table structure for clarity.
+
+feat(profile.html): add user profile editing feature
+
+Allow users to update their display name and profile picture.
+
+NEVER generate a commit message {never_scope}. The scope MUST contain the filename(s) affected by the change described in that line.
+"""
+
+# Anthropic ignores cache breakpoints on prefixes shorter than this many tokens
+MIN_CACHEABLE_TOKENS = 1024
+
 # Initial diff prompt
 INIT_DIFF_PROMPT = {
     "role": "user",
@@ -46,6 +123,15 @@ class CommitLintConfig:
             "revert": "Reverts a previous commit"
         }
 
+        # Bullet list for the standard type enum, which most configs use unchanged
+        self._default_types = tuple(self.type_descriptions)
+        self._default_type_enum_text = "\n  - ".join(
+            f"{v} ({description})" for v, description in self.type_descriptions.items()
+        )
+
+        # Rule name -> prompt builder, built once instead of for every rule
+        self._rules_prompts = self.rules_prompts()
+
     def get_translation(self, language: str) -> Dict[str, str]:
         """Get translation for the specified language."""
         translations = {
@@ -81,10 +167,7 @@ class CommitLintConfig:
                 
             "enumTypeRule": lambda key, applicable, value, prompt: 
                 f"The {key} should {applicable} be one of the following values:\n  - " + 
-                "\n  - ".join([f"{v} ({self.get_type_rule_extra_description(v, prompt) or self.type_descriptions.get(v, '')})" 
-                              if (self.get_type_rule_extra_description(v, prompt) or self.type_descriptions.get(v, '')) 
-                              else v 
-                              for v in value]) if isinstance(value, list) else 
+                self._format_type_enum(value, prompt) if isinstance(value, list) else 
                 f"The {key} should {applicable} be one of the following values: {value}",
                 
             "fullStopRule": lambda key, applicable, value, *_: 
@@ -97,6 +180,18 @@ class CommitLintConfig:
                 f"The {key} should {applicable} have {value} characters or more.",
         }
     
+    def _format_type_enum(self, values: List[str], prompt: Optional[Dict[str, Any]]) -> str:
+        """Format type enum values as a bullet list with their descriptions."""
+        has_custom_descriptions = (prompt or {}).get("questions", {}).get("type", {}).get("enum")
+        if not has_custom_descriptions and tuple(values) == self._default_types:
+            return self._default_type_enum_text
+        return "\n  - ".join([self._format_type_value(v, prompt) for v in values])
+
+    def _format_type_value(self, type_value: str, prompt: Dict[str, Any]) -> str:
+        """Format a type enum value with its description, if it has one."""
+        description = self.get_type_rule_extra_description(type_value, prompt) or self.type_descriptions.get(type_value, '')
+        return f"{type_value} ({description})" if description else type_value
+
     def _format_case_value(self, value: Union[str, List[str]]) -> str:
         """Format case value for display in rules."""
         if isinstance(value, list):
@@ -219,13 +314,12 @@ class CommitLintConfig:
         if severity == 0:  # RuleConfigSeverity.Disabled
             return None
 
-        prompt_fn = self.rules_prompts().get(rule_name)
+        prompt_fn = self._rules_prompts.get(rule_name)
         if prompt_fn:
             return prompt_fn(applicable, value, prompt)
         
         # Handle custom rules or missing handlers
-        if not logger.disabled:
-            logger.warning(f"No prompt handler for rule '{rule_name}'.")
+        logger.warning("No prompt handler for rule '%s'.", rule_name)
         return f"The {rule_name} should {applicable} follow the rule with value: {value}"
 
     def infer_prompts_from_commitlint_config(self, commitlint_config: Dict[str, Any]) -> List[str]:
@@ -233,9 +327,8 @@ class CommitLintConfig:
         rules = commitlint_config.get("rules", {})
         prompt_config = commitlint_config.get("prompt", {})
         
-        if not logger.disabled:
-            logger.debug(f"Processing {len(rules)} commitlint rules")
-            
+        logger.debug("Processing %s commitlint rules", len(rules))
+        
         prompts = []
         for rule_name, rule_config in rules.items():
             inferred_prompt = self.get_prompt(rule_name, rule_config, prompt_config)
@@ -248,131 +341,165 @@ class CommitLintConfig:
 commitlint_config = CommitLintConfig(config)
 
 
-def create_commit_prompt(diff: str, context: str = "") -> List[Dict[str, str]]:
+@functools.lru_cache(maxsize=None)
+def _static_system_prompt(omit_scope: bool, use_emoji: bool, add_description: bool,
+                          add_why: bool, one_line_commit: bool) -> str:
     """
-    Create a well-engineered prompt for commit message generation using commitlint rules.
-    
+    Build the part of the commit system prompt that only depends on config flags.
+
+    Kept free of per-commit values so providers can cache it as a prompt prefix.
+
     Args:
-        diff: Git diff
-        context: Additional context
-        
+        omit_scope: OCO_OMIT_SCOPE
+        use_emoji: OCO_EMOJI
+        add_description: OCO_DESCRIPTION
+        add_why: OCO_WHY
+        one_line_commit: OCO_ONE_LINE_COMMIT
+
     Returns:
-        List of messages for the LLM
+        Static system prompt text
     """
-    # Get configuration values
-    omit_scope = config.get(ConfigKeys.OCO_OMIT_SCOPE, False)
-    use_emoji = config.get(ConfigKeys.OCO_EMOJI, False)
-    add_description = config.get(ConfigKeys.OCO_DESCRIPTION, True)  # Default to True for better messages
-    add_why = config.get(ConfigKeys.OCO_WHY, True)  # Default to True for better messages
-    one_line_commit = config.get(ConfigKeys.OCO_ONE_LINE_COMMIT, False)
-    
-    # Extract file names from diff
-    file_names = extract_file_names_from_diff(diff)
-    if not logger.disabled:
-        logger.debug(f"File names from diff: {file_names}")
-    
-    # For display in the prompt
-    file_names_str = ", ".join(file_names) if file_names else "unknown"
-    
-    # Define commit structure based on config
-    structure_of_commit = (
-        "- Header of commit is composed of type and subject: <type-of-commit>: <subject-of-commit>\n"
-        "- Description of commit is composed of body and footer (optional): <body-of-commit>\n<footer(s)-of-commit>"
-    ) if omit_scope else (
-        "- Header of commit is composed of type, scope, subject: <type-of-commit>(<scope-of-commit>): <subject-of-commit>\n"
-        "- Description of commit is composed of body and footer (optional): <body-of-commit>\n<footer(s)-of-commit>"
-    )
-    
-    # Build the system prompt
-    system_content = f"{IDENTITY} Your mission is to create clean and comprehensive commit messages in the conventional commit format."
+    parts = [f"{IDENTITY} Your mission is to create clean and comprehensive commit messages in the conventional commit format."]
     
     if add_why:
-        system_content += " Explain WHAT were the changes and WHY they were done."
+        parts.append(" Explain WHAT were the changes and WHY they were done.")
     else:
-        system_content += " Explain WHAT were the changes."
+        parts.append(" Explain WHAT were the changes.")
         
-    system_content += " I'll send you an output of 'git diff --staged' command, and you convert it into a commit message.\n"
+    parts.append(" I'll send you an output of 'git diff --staged' command, and you convert it into a commit message.\n")
     
     if use_emoji:
-        system_content += "Use GitMoji convention to preface the commit.\n"
+        parts.append("Use GitMoji convention to preface the commit.\n")
     else:
-        system_content += "Do not preface the commit with anything.\n"
+        parts.append("Do not preface the commit with anything.\n")
     
     if add_description:
-        system_content += "Add a detailed description of the changes after the commit message header. Start the description on a new line after a blank line. Don't start it with 'This commit', just describe the changes and their purpose.\n"
+        parts.append("Add a detailed description of the changes after the commit message header. Start the description on a new line after a blank line. Don't start it with 'This commit', just describe the changes and their purpose.\n")
     else:
-        system_content += "Don't add any descriptions to the commit, only the commit message header (type, scope, subject).\n"
+        parts.append("Don't add any descriptions to the commit, only the commit message header (type, scope, subject).\n")
     
-    system_content += f"Use the present tense. Use {language} to answer.\n"
+    parts.append(f"Use the present tense. Use {language} to answer.\n")
     
     if one_line_commit:
-        system_content += "Craft a concise commit message header that encapsulates all changes made, with an emphasis on the primary updates. "
-        system_content += "If the modifications share a common theme or scope, mention it succinctly; otherwise, leave the scope out to maintain focus. "
-        system_content += "The goal is to provide a clear and unified overview of the changes in a one single message header, without diverging into a list of commit per file change.\n"
+        parts.append("Craft a concise commit message header that encapsulates all changes made, with an emphasis on the primary updates. ")
+        parts.append("If the modifications share a common theme or scope, mention it succinctly; otherwise, leave the scope out to maintain focus. ")
+        parts.append("The goal is to provide a clear and unified overview of the changes in a one single message header, without diverging into a list of commit per file change.\n")
     
     # Define commit structure and scope rules
     if omit_scope:
-        system_content += "Do not include a scope in the commit message format. Use the format: <type>: <subject>\n"
+        parts.append("Do not include a scope in the commit message format. Use the format: <type>: <subject>\n")
         structure_of_commit = (
             "- Header: <type>: <subject>\n"
             "- Body/Footer (Optional): <description>"
         )
     else:
-        system_content += "ALWAYS include a scope in the commit message format. Use the format: <type>(<scope>): <subject>\n"
-        system_content += f"The files changed in this commit are: {file_names_str}.\n"
+        parts.append("ALWAYS include a scope in the commit message format. Use the format: <type>(<scope>): <subject>\n")
 
         # More direct instructions for scope determination using filenames
-        system_content += "The scope MUST contain the filename(s) changed for that specific commit line.\n"
-        system_content += "If a commit line addresses changes in multiple files, list them comma-separated in the scope (e.g., `file1.py, file2.ts`).\n"
-        system_content += "If a single file is changed, use just that filename (e.g., `main.py`).\n"
+        parts.append("The scope MUST contain the filename(s) changed for that specific commit line.\n")
+        parts.append("If a commit line addresses changes in multiple files, list them comma-separated in the scope (e.g., `file1.py, file2.ts`).\n")
+        parts.append("If a single file is changed, use just that filename (e.g., `main.py`).\n")
 
         structure_of_commit = (
             "- Header: <type>(<scope>): <subject>\n"
             "- Body/Footer (Optional): <description>"
         )
 
-    # Add explicit instructions for conventional commit format with detailed examples
-    system_content += f"""
-Your commit message MUST follow the conventional commit format.
-
-Structure:
-{structure_of_commit}
-
-Header Rules:
-- Type: Must be lowercase. Choose from: feat, fix, docs, style, refactor, perf, test, build, ci, chore, revert.
-- Scope: { 'Should be omitted.' if omit_scope else 'MUST be included in parentheses. Use the suggested scope or a meaningful name reflecting the changed component/files.'}
-- Subject: Concise description of the change in imperative mood (e.g., 'add', 'fix', 'update'). Do not end with a period. Keep the header line under 72 characters.
-
-Body/Footer Rules (only if OCO_DESCRIPTION=true):
-- Separate header from body with a blank line.
-- Explain WHAT changed and WHY for *all* changes.
-- Keep lines under 72 characters.
-
-IMPORTANT: If the provided diff contains multiple distinct logical changes (e.g., a refactoring AND a new feature, or documentation updates AND a bug fix), you MUST generate a separate conventional commit header line for EACH distinct change. Follow each header line with its corresponding description if OCO_DESCRIPTION is true, or list all headers first followed by a combined description.
+    parts.append(_FORMAT_RULES_TMPL.format_map({
+        "structure_of_commit": structure_of_commit,
+        "scope_rule": "Should be omitted." if omit_scope else "MUST be included in parentheses. Use the suggested scope or a meaningful name reflecting the changed component/files.",
+        "never_scope": "with a scope in parentheses" if omit_scope else "without a scope in parentheses containing the relevant filename(s)",
+    }))
+    return "".join(parts)
 
-Examples (assuming OCO_OMIT_SCOPE=false):
 
-Single Change (Single File):
-feat(auth.py): implement OAuth2 authentication flow
+@functools.lru_cache(maxsize=None)
+def _minimal_system_prompt(omit_scope: bool, use_emoji: bool, add_description: bool,
+                           add_why: bool, one_line_commit: bool) -> str:
+    """
+    Build a compact commit system prompt, without examples, for trivially small diffs.
 
-Add OAuth2 authentication support with Google and GitHub providers.
-This improves security by using industry-standard protocols and allows users
-to log in with existing accounts, reducing onboarding friction.
+    Takes the same flags as _static_system_prompt; one_line_commit is accepted
+    for symmetry but a single small change only ever gets one header.
 
-Multiple Distinct Changes (Multiple Files):
-refactor(auth.py, user.py): simplify login logic and database schema
+    Returns:
+        Minimal system prompt text
+    """
+    parts = [f"{IDENTITY} Convert the output of 'git diff --staged' I send you into a conventional commit message.\n"]
+    
+    if omit_scope:
+        parts.append("Use the format: <type>: <subject>\n")
+    else:
+        parts.append("Use the format: <type>(<scope>): <subject>, with the changed filename as the scope.\n")
+    
+    parts.append("Type is one of: feat, fix, docs, style, refactor, perf, test, build, ci, chore, revert. ")
+    parts.append("Write the subject in imperative mood, without a trailing period, and keep the header under 72 characters.\n")
+    
+    if use_emoji:
+        parts.append("Use GitMoji convention to preface the commit.\n")
+    else:
+        parts.append("Do not preface the commit with anything.\n")
+    
+    if add_description:
+        parts.append(f"After a blank line, briefly describe WHAT changed{' and WHY' if add_why else ''}.\n")
+    else:
+        parts.append("Only output the header line.\n")
+    
+    parts.append(f"Use the present tense. Use {language} to answer.\n")
+    return "".join(parts)
 
-Streamline the authentication process and update user table structure for clarity.
 
-feat(profile.html): add user profile editing feature
+@functools.lru_cache(maxsize=None)
+def _is_cacheable_prefix(text: str) -> bool:
+    """Check whether a system prompt prefix is long enough for Anthropic to cache."""
+    return token_count(text) >= MIN_CACHEABLE_TOKENS
 
-Allow users to update their display name and profile picture.
 
-NEVER generate a commit message {'with a scope in parentheses' if omit_scope else 'without a scope in parentheses containing the relevant filename(s)'}. The scope MUST contain the filename(s) affected by the change described in that line.
-"""
+def create_commit_prompt(diff: str, context: str = "") -> List[Dict[str, Any]]:
+    """
+    Create a well-engineered prompt for commit message generation using commitlint rules.
+    
+    Diffs smaller than OCO_MINIMAL_PROMPT_THRESHOLD bytes that touch at most one
+    file get a compact system prompt instead of the full rules and examples.
+    
+    Args:
+        diff: Git diff
+        context: Additional context
+        
+    Returns:
+        List of messages for the LLM
+    """
+    # Extract file names from diff
+    file_names = extract_file_names_from_diff(diff)
+    logger.debug("File names from diff: %s", file_names)
+    
+    if len(diff.encode("utf-8")) < MINIMAL_PROMPT_THRESHOLD and len(file_names) <= 1:
+        # Far below the cacheable minimum, so it never gets a cache breakpoint
+        static_content = _minimal_system_prompt(*PROMPT_CONFIG)
+        use_cache_control = False
+    else:
+        static_content = _static_system_prompt(*PROMPT_CONFIG)
+        use_cache_control = CACHE_CONTROL and _is_cacheable_prefix(static_content)
+    
+    # Per-commit details go after the static prefix so it stays cacheable
+    dynamic_content = ""
+    if not PROMPT_CONFIG.omit_scope:
+        # For display in the prompt
+        file_names_str = ", ".join(file_names) if file_names else "unknown"
+        dynamic_content += f"The files changed in this commit are: {file_names_str}.\n"
 
     if context:
-        system_content += f"\nAdditional context from the user: {context}"
+        dynamic_content += f"\nAdditional context from the user: {context}"
+    
+    if use_cache_control:
+        # Mark the static prefix as an Anthropic prompt-cache breakpoint
+        system_content = [
+            {"type": "text", "text": static_content, "cache_control": {"type": "ephemeral"}},
+        ]
+        if dynamic_content:
+            system_content.append({"type": "text", "text": dynamic_content})
+    else:
+        system_content = static_content + dynamic_content
     
     # Create the messages array
     messages = [
@@ -393,28 +520,15 @@ def extract_file_names_from_diff(diff: str) -> List[str]:
     Returns:
         List of file names
     """
-    import re
-    
-    # Pattern to match file names in git diff - use word boundary to avoid capturing quotes
-    pattern = r"diff --git a/(.*?) b/(.*?)(?:\s|$)"
-    
-    # Find all matches
-    matches = re.findall(pattern, diff, re.MULTILINE)
-    
-    # Extract the 'b' file names (current version)
-    file_names = []
-    for match in matches:
-        if match[1]:
-            # Remove any trailing whitespace or special characters
-            clean_name = match[1].strip()
-            # Skip any entries that look like regex patterns (containing special chars)
-            if any(c in clean_name for c in '*?()[]{}^$+\\'):
-                continue
-            file_names.append(clean_name)
+    # Take the 'b' file names (current version), skipping entries that look
+    # like regex patterns (containing special chars)
+    file_names = [
+        match.group(1)
+        for match in DIFF_HEADER_RE.finditer(diff)
+        if match.group(1) and not any(c in match.group(1) for c in '*?()[]{}^$+\\')
+    ]
     
-    # Debug output
-    if logger and not logger.disabled:
-        logger.debug(f"Extracted file names: {file_names}")
+    logger.debug("Extracted file names: %s", file_names)
     
     return file_names
 
@@ -444,40 +558,40 @@ def create_consistency_prompt(prompts: List[str]) -> List[Dict[str, str]]:
     Returns:
         List of messages for the LLM
     """
-    # Get configuration
-    omit_scope = config.get(ConfigKeys.OCO_OMIT_SCOPE, False)
+    omit_scope = PROMPT_CONFIG.omit_scope
     
     # Get translation
     local_language = get_text("localLanguage")
     
-    system_content = f"{IDENTITY} Your mission is to create clean and comprehensive commit messages for two different changes in a single codebase and output them in the provided JSON format: one for a bug fix and another for a new feature.\n\n"
+    parts = [f"{IDENTITY} Your mission is to create clean and comprehensive commit messages for two different changes in a single codebase and output them in the provided JSON format: one for a bug fix and another for a new feature.\n\n"]
     
-    system_content += "Here are the specific requirements and conventions that should be strictly followed:\n\n"
+    parts.append("Here are the specific requirements and conventions that should be strictly followed:\n\n")
     
-    system_content += "Commit Message Conventions:\n"
-    system_content += "- The commit message consists of three parts: Header, Body, and Footer.\n"
-    system_content += f"- Header: \n  - Format: {('`<type>: <subject>`') if omit_scope else ('`<type>(<scope>): <subject>`')}\n"
-    system_content += "- " + "\n- ".join(prompts) + "\n\n"
+    parts.append("Commit Message Conventions:\n")
+    parts.append("- The commit message consists of three parts: Header, Body, and Footer.\n")
+    parts.append(f"- Header: \n  - Format: {('`<type>: <subject>`') if omit_scope else ('`<type>(<scope>): <subject>`')}\n")
+    parts.append("- " + "\n- ".join(prompts) + "\n\n")
     
-    system_content += "JSON Output Format:\n"
-    system_content += "- The JSON output should contain the commit messages for a bug fix and a new feature in the following format:\n"
-    system_content += "{\n"
-    system_content += f'  "localLanguage": "{local_language}",\n'
-    system_content += '  "commitFix": "<Header of commit for bug fix with scope>",\n'
-    system_content += '  "commitFeat": "<Header of commit for feature with scope>",\n'
-    system_content += '  "commitFixOmitScope": "<Header of commit for bug fix without scope>",\n'
-    system_content += '  "commitFeatOmitScope": "<Header of commit for feature without scope>",\n'
-    system_content += '  "commitDescription": "<Description of commit for both the bug fix and the feature>"\n'
-    system_content += "}\n\n"
+    parts.append("JSON Output Format:\n")
+    parts.append("- The JSON output should contain the commit messages for a bug fix and a new feature in the following format:\n")
+    parts.append("{\n")
+    parts.append(f'  "localLanguage": "{local_language}",\n')
+    parts.append('  "commitFix": "<Header of commit for bug fix with scope>",\n')
+    parts.append('  "commitFeat": "<Header of commit for feature with scope>",\n')
+    parts.append('  "commitFixOmitScope": "<Header of commit for bug fix without scope>",\n')
+    parts.append('  "commitFeatOmitScope": "<Header of commit for feature without scope>",\n')
+    parts.append('  "commitDescription": "<Description of commit for both the bug fix and the feature>"\n')
+    parts.append("}\n\n")
     
-    system_content += "- The \"commitDescription\" should not include the commit message's header, only the description.\n"
-    system_content += "- Description should not be more than 74 characters.\n\n"
+    parts.append("- The \"commitDescription\" should not include the commit message's header, only the description.\n")
+    parts.append("- Description should not be more than 74 characters.\n\n")
     
-    system_content += "Additional Details:\n"
-    system_content += "- Changing the variable 'port' to uppercase 'PORT' is considered a bug fix.\n"
-    system_content += "- Allowing the server to listen on a port specified through the environment variable is considered a new feature.\n\n"
+    parts.append("Additional Details:\n")
+    parts.append("- Changing the variable 'port' to uppercase 'PORT' is considered a bug fix.\n")
+    parts.append("- Allowing the server to listen on a port specified through the environment variable is considered a new feature.\n\n")
     
-    system_content += "Example Git Diff is to follow:"
+    parts.append("Example Git Diff is to follow:")
+    system_content = "".join(parts)
     
     # Create the messages array
     messages = [
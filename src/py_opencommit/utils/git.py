@@ -1,5 +1,6 @@
 """Git utilities for OpenCommit."""
 
+import functools
 import subprocess
 import os
 import platform
@@ -10,6 +11,14 @@ from pathlib import Path
 # Constants
 MAX_DIFF_SIZE = 50000  # Characters - when to split the diff
 GIT_ERROR_PATTERN = re.compile(r"^fatal:|^error:", re.MULTILINE)
+DIFF_TRUNCATED_MARKER = "# ... (diff truncated)\n"  # Appended by get_staged_diff(max_bytes)
+# git is a real executable on Windows too, so no shell is needed; just keep
+# each call from flashing a console window
+_IS_WINDOWS = platform.system() == "Windows"
+_CREATIONFLAGS = subprocess.CREATE_NO_WINDOW if _IS_WINDOWS else 0
+# A template comment line: optional leading whitespace (not newlines), then "#"
+TEMPLATE_COMMENT_PATTERN = re.compile(r"^[^\S\n]*#.*$", re.MULTILINE)
+FILE_HEADER_PATTERN = re.compile(r"^diff --git a/(.*?) b/(.*?)$", re.MULTILINE)
 
 
 class GitError(Exception):
@@ -36,32 +45,36 @@ def _run_git_command(args: List[str], check: bool = True) -> subprocess.Complete
         if not args or args[0] != "git":
             args.insert(0, "git")
             
-        # Handle Windows vs Unix differences
-        shell = platform.system() == "Windows"
-        
-        # Run the command
+        # Run the command, capturing raw bytes; decoding the whole buffer once
+        # is cheaper than text mode's incremental locale decoding on big diffs
         result = subprocess.run(
             args,
             capture_output=True,
-            text=True,
             check=check,
-            shell=shell,
+            creationflags=_CREATIONFLAGS,
         )
+        result.stdout = result.stdout.decode("utf-8", errors="replace")
+        result.stderr = result.stderr.decode("utf-8", errors="replace")
         return result
     except subprocess.CalledProcessError as e:
         # Extract useful error message from git output
-        error_msg = e.stderr.strip() if e.stderr else str(e)
-        if GIT_ERROR_PATTERN.search(error_msg):
-            error_msg = GIT_ERROR_PATTERN.search(error_msg).group(0)
+        error_msg = e.stderr.decode("utf-8", errors="replace").strip() if e.stderr else str(e)
+        match = GIT_ERROR_PATTERN.search(error_msg)
+        if match:
+            error_msg = match.group(0)
         raise GitError(f"Git command failed: {' '.join(args)}\n{error_msg}")
     except FileNotFoundError:
         raise GitError("Git executable not found. Make sure Git is installed and in your PATH.")
 
 
+@functools.lru_cache(maxsize=1)
 def get_git_root() -> Optional[str]:
     """
     Get the root directory of the git repository.
     
+    The root can't change during a run, so it is looked up once; call
+    get_git_root.cache_clear() after changing directory.
+    
     Returns:
         Path to git root or None if not in a repo
     """
@@ -97,8 +110,9 @@ def get_staged_files() -> List[str]:
     Returns:
         List of staged file paths relative to repo root
     """
-    result = _run_git_command(["git", "diff", "--name-only", "--cached"])
-    return [f for f in result.stdout.strip().split("\n") if f]
+    # -z gives NUL-terminated, unquoted names, so no name needs unescaping
+    result = _run_git_command(["git", "diff", "--name-only", "--cached", "-z"])
+    return [f for f in result.stdout.split("\0") if f]
 
 
 def get_changed_files() -> List[str]:
@@ -108,15 +122,10 @@ def get_changed_files() -> List[str]:
     Returns:
         List of changed file paths relative to repo root
     """
-    staged = _run_git_command(["git", "diff", "--name-only", "--cached"])
-    unstaged = _run_git_command(["git", "diff", "--name-only"])
+    staged, unstaged, _ = get_status_files(include_untracked=False)
     
     # Combine and deduplicate
-    all_files = set()
-    for output in [staged.stdout, unstaged.stdout]:
-        all_files.update([f for f in output.strip().split("\n") if f])
-    
-    return sorted(list(all_files))
+    return sorted(set(staged).union(unstaged))
 
 
 def get_untracked_files() -> List[str]:
@@ -127,20 +136,70 @@ def get_untracked_files() -> List[str]:
         List of untracked file paths relative to repo root
     """
     # Use --exclude-standard to respect .gitignore
-    result = _run_git_command(["git", "ls-files", "--others", "--exclude-standard"])
-    return [f for f in result.stdout.strip().split("\n") if f]
+    result = _run_git_command(["git", "ls-files", "--others", "--exclude-standard", "-z"])
+    return [f for f in result.stdout.split("\0") if f]
+
+
+def get_status_files(include_untracked: bool = True) -> Tuple[List[str], List[str], List[str]]:
+    """
+    Get staged, unstaged and untracked files from a single `git status` call.
+    
+    Args:
+        include_untracked: Whether to list untracked files; skipping them
+            spares git a scan of the untracked parts of the worktree
+    
+    Returns:
+        Tuple of (staged, unstaged, untracked) file paths relative to repo root
+    """
+    result = _run_git_command(
+        ["git", "status", "--porcelain=v2", "-z",
+         "--untracked-files=all" if include_untracked else "--untracked-files=no"]
+    )
+    staged, unstaged, untracked = [], [], []
+
+    entries = iter(result.stdout.split("\0"))
+    for entry in entries:
+        kind = entry[:1]
+        if kind == "?":
+            untracked.append(entry[2:])
+            continue
+        if kind == "1":
+            path = entry.split(" ", 8)[8]
+        elif kind == "2":
+            path = entry.split(" ", 9)[9]
+            # Renames and copies are followed by their original path
+            next(entries, None)
+        elif kind == "u":
+            path = entry.split(" ", 10)[10]
+        else:
+            continue
 
+        index_status, worktree_status = entry[2], entry[3]
+        if index_status != ".":
+            staged.append(path)
+        if worktree_status != ".":
+            unstaged.append(path)
 
-def get_staged_diff() -> str:
+    return staged, unstaged, untracked
+
+
+def get_staged_diff(max_bytes: Optional[int] = None) -> str:
     """
     Get the diff of staged changes.
     
+    Args:
+        max_bytes: If given, read at most this many bytes of git's output
+            and truncate the diff at the last complete line
+    
     Returns:
         Git diff as string
         
     Raises:
         GitError: If getting diff fails
     """
+    if max_bytes is not None:
+        return _read_staged_diff(max_bytes)
+
     try:
         result = _run_git_command(["git", "diff", "--cached"])
         return result.stdout
@@ -148,6 +207,63 @@ def get_staged_diff() -> str:
         raise GitError(f"Failed to get staged diff: {e}")
 
 
+def _spawn_staged_diff() -> subprocess.Popen:
+    """
+    Start `git diff --cached` with its output piped back as bytes.
+    
+    Returns:
+        The running git process
+        
+    Raises:
+        GitError: If git is not installed
+    """
+    try:
+        return subprocess.Popen(
+            ["git", "diff", "--cached"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            creationflags=_CREATIONFLAGS,
+        )
+    except FileNotFoundError:
+        raise GitError("Git executable not found. Make sure Git is installed and in your PATH.")
+
+
+def _read_staged_diff(max_bytes: int) -> str:
+    """
+    Stream the staged diff from git, stopping once max_bytes have been read.
+    
+    Args:
+        max_bytes: Maximum number of bytes to read
+        
+    Returns:
+        Git diff as string, with a truncation marker if it was cut short
+        
+    Raises:
+        GitError: If getting diff fails
+    """
+    proc = _spawn_staged_diff()
+    with proc:
+        data = proc.stdout.read(max_bytes + 1)
+        truncated = len(data) > max_bytes
+        if truncated:
+            # The rest of the diff is not needed
+            proc.kill()
+        _, stderr = proc.communicate()
+
+    if not truncated:
+        if proc.returncode != 0:
+            error_msg = stderr.decode("utf-8", errors="replace").strip()
+            raise GitError(f"Failed to get staged diff: {error_msg}")
+        return data.decode("utf-8", errors="replace")
+
+    # Cut at the last complete line so no line or multi-byte character is split
+    data = data[:max_bytes]
+    last_newline = data.rfind(b"\n")
+    if last_newline != -1:
+        data = data[:last_newline + 1]
+    return data.decode("utf-8", errors="replace") + DIFF_TRUNCATED_MARKER
+
+
 def split_diff_by_files(diff: str) -> Dict[str, str]:
     """
     Split a large diff into separate diffs by file.
@@ -158,31 +274,20 @@ def split_diff_by_files(diff: str) -> Dict[str, str]:
     Returns:
         Dictionary mapping filenames to their diffs
     """
+    # Splitting on the header pattern yields
+    # [preamble, a_path1, b_path1, body1, a_path2, b_path2, body2, ...]
+    parts = FILE_HEADER_PATTERN.split(diff)
+    last = len(parts) - 3
+
     file_diffs = {}
-    current_file = None
-    current_diff = []
-    
-    # Pattern to match the start of a new file diff
-    file_header_pattern = re.compile(r"^diff --git a/(.*?) b/(.*?)$")
-    
-    for line in diff.split("\n"):
-        match = file_header_pattern.match(line)
-        if match:
-            # Save previous file diff if exists
-            if current_file and current_diff:
-                file_diffs[current_file] = "\n".join(current_diff)
-                current_diff = []
-            
-            # Start new file diff
-            current_file = match.group(2)  # Use the "b" path as the current file
-            current_diff = [line]
-        elif current_file:
-            current_diff.append(line)
-    
-    # Add the last file
-    if current_file and current_diff:
-        file_diffs[current_file] = "\n".join(current_diff)
-        
+    for i in range(1, len(parts), 3):
+        a_path, b_path, body = parts[i], parts[i + 1], parts[i + 2]
+        # Drop the newline that precedes the next header
+        if i < last:
+            body = body[:-1]
+        # Key on the "b" path, the file's current name
+        file_diffs[b_path] = f"diff --git a/{a_path} b/{b_path}{body}"
+
     return file_diffs
 
 
@@ -198,22 +303,28 @@ def merge_diffs(diffs: List[str], max_size: int = MAX_DIFF_SIZE) -> List[str]:
         List of merged diffs, each under max_size
     """
     merged_diffs = []
-    current_diff = ""
+    # Collect the parts of each merged diff and join them once, tracking the
+    # joined length instead of rebuilding the string on every append
+    current_parts: List[str] = []
+    current_len = 0
     
     for diff in diffs:
         # If adding this diff would exceed max_size, start a new merged diff
-        if len(current_diff) + len(diff) > max_size and current_diff:
-            merged_diffs.append(current_diff)
-            current_diff = diff
+        if current_len and current_len + len(diff) > max_size:
+            merged_diffs.append("\n".join(current_parts))
+            current_parts = [diff]
+            current_len = len(diff)
+        elif current_len:
+            # Append this diff to current merged diff with a separator
+            current_parts.append(diff)
+            current_len += 1 + len(diff)
         else:
-            # Append this diff to current merged diff with separator if needed
-            if current_diff:
-                current_diff += "\n"
-            current_diff += diff
+            current_parts = [diff]
+            current_len = len(diff)
     
     # Add the final merged diff if there's anything left
-    if current_diff:
-        merged_diffs.append(current_diff)
+    if current_len:
+        merged_diffs.append("\n".join(current_parts))
     
     return merged_diffs
 
@@ -223,7 +334,8 @@ def stage_files(files: List[str]) -> None:
     Stage the specified files.
     
     Args:
-        files: List of files to stage
+        files: List of files to stage, relative to the repository root as
+            listed by get_status_files
         
     Raises:
         GitError: If staging fails
@@ -236,8 +348,13 @@ def stage_files(files: List[str]) -> None:
     if not sanitized_files:
         return
         
+    # Run from the repository root so root-relative paths resolve from any subdirectory
+    root = get_git_root()
+    git_cmd = ["git", "-C", root] if root else ["git"]
+        
     try:
-        _run_git_command(["git", "add"] + sanitized_files)
+        # "--" keeps file names that start with "-" from being read as options
+        _run_git_command(git_cmd + ["add", "--"] + sanitized_files)
     except GitError as e:
         raise GitError(f"Failed to stage files: {e}")
 
@@ -255,29 +372,22 @@ def stage_all_changes() -> None:
         raise GitError(f"Failed to stage all changes: {e}")
 
 
-def stage_files(files: List[str]) -> None:
+def stage_all_if_needed() -> bool:
     """
-    Stage specific files.
+    Stage all changes, skipping `git add -A` when there is nothing to stage.
+    
+    Returns:
+        True if changes were staged, False if the worktree was already clean
     
-    Args:
-        files: List of file paths to stage
-        
     Raises:
-        GitError: If staging fails
+        GitError: If reading the status or staging fails
     """
-    if not files:
-        return
+    _, unstaged, untracked = get_status_files()
+    if not unstaged and not untracked:
+        return False
 
-    try:
-        for file in files:
-            # Add check to skip empty or whitespace-only filenames
-            if file and file.strip():
-                _run_git_command(["git", "add", file.strip()])
-            else:
-                # Optionally log a warning or just skip
-                pass 
-    except GitError as e:
-        raise GitError(f"Failed to stage files: {e}")
+    stage_all_changes()
+    return True
 
 
 def get_commit_template() -> Optional[str]:
@@ -330,9 +440,7 @@ def apply_commit_template(message: str, template: str) -> str:
     
     # If template has comments, keep them
     if '#' in template:
-        template_lines = template.split('\n')
-        message_lines = [line for line in template_lines if not line.strip().startswith('#')]
-        comment_lines = [line for line in template_lines if line.strip().startswith('#')]
+        comment_lines = TEMPLATE_COMMENT_PATTERN.findall(template)
         
         # Insert message at the top
         return message + '\n\n' + '\n'.join(comment_lines)
@@ -405,8 +513,18 @@ def get_repo_status() -> Dict[str, bool]:
     Returns:
         Dictionary with status flags
     """
+    # One `git status` answers all three; it fails outside a repository
+    try:
+        staged, unstaged, _ = get_status_files(include_untracked=False)
+    except GitError:
+        return {
+            "has_staged_changes": False,
+            "has_unstaged_changes": False,
+            "is_git_repo": False,
+        }
+
     return {
-        "has_staged_changes": has_staged_changes(),
-        "has_unstaged_changes": has_unstaged_changes(),
-        "is_git_repo": get_git_root() is not None,
+        "has_staged_changes": bool(staged),
+        "has_unstaged_changes": bool(unstaged),
+        "is_git_repo": True,
     }
@@ -1,10 +1,47 @@
 """Token counting utilities for OpenCommit."""
 
+import functools
+import os
+from typing import List
+
 import tiktoken
 
 
+# Longer strings (whole diffs, chunks) are counted without being cached, so
+# the cache never keeps large diffs alive
+MAX_CACHED_CHARS = 64 * 1024
+
+
+def _count(content: str) -> int:
+    encoding = tiktoken.get_encoding("cl100k_base")
+    return len(encoding.encode(content))
+
+
+_cached_count = functools.lru_cache(maxsize=256)(_count)
+
+
 def token_count(content: str) -> int:
     """Count the number of tokens in the given content."""
+    if len(content) > MAX_CACHED_CHARS:
+        return _count(content)
+    return _cached_count(content)
+
+
+def token_count_batch(contents: List[str]) -> List[int]:
+    """Count the number of tokens in each of the given contents in one batched call."""
+    if not contents:
+        return []
+    encoding = tiktoken.get_encoding("cl100k_base")
+    return [len(tokens) for tokens in encoding.encode_batch(contents, num_threads=os.cpu_count() or 1)]
+
+
+def encode(content: str) -> List[int]:
+    """Encode the given content into tokens."""
+    encoding = tiktoken.get_encoding("cl100k_base")
+    return encoding.encode(content)
+
+
+def decode(tokens: List[int]) -> str:
+    """Decode tokens back into text."""
     encoding = tiktoken.get_encoding("cl100k_base")
-    tokens = encoding.encode(content)
-    return len(tokens)
+    return encoding.decode(tokens)
@@ -1,18 +1,26 @@
 """Configuration for pytest."""
 
+import asyncio
 import sys
 import os
 import pytest
-import tempfile
-from pathlib import Path
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 from click.testing import CliRunner
 
 # Add project root to Python path
 # No longer needed if installed editable or tests run via pytest from root
 # sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
+from py_opencommit.commands import config as config_module
 from py_opencommit.commands.config import ConfigKeys, DEFAULT_CONFIG
+from py_opencommit.engine.base import AiEngineConfig
+
+
+@pytest.fixture(autouse=True)
+def clear_config_cache():
+    """Start every test without parsed config files cached by earlier tests."""
+    config_module._CONFIG_CACHE.clear()
+    yield
 
 
 @pytest.fixture
@@ -29,10 +37,10 @@ def mock_git_repo():
             yield
 
 
-@pytest.fixture
-def mock_staged_diff():
-    """Mock git diff output for staged changes."""
-    diff = """diff --git a/file1.txt b/file1.txt
+@pytest.fixture(scope="session")
+def staged_diff_text():
+    """Sample git diff output for staged changes."""
+    return """diff --git a/file1.txt b/file1.txt
 index 1234567..abcdef 100644
 --- a/file1.txt
 +++ b/file1.txt
@@ -47,8 +55,13 @@ index 9876543..fedcba 100644
 @@ -1,2 +1 @@
 -line1
  line2"""
-    with patch('py_opencommit.utils.git.get_staged_diff', return_value=diff):
-        yield diff
+
+
+@pytest.fixture
+def mock_staged_diff(staged_diff_text):
+    """Mock git diff output for staged changes."""
+    with patch('py_opencommit.utils.git.get_staged_diff', return_value=staged_diff_text):
+        yield staged_diff_text
 
 
 @pytest.fixture
@@ -60,6 +73,14 @@ def mock_staged_files():
             yield files
 
 
+@pytest.fixture
+def mock_subprocess_run(monkeypatch):
+    """Mock subprocess.run as seen by the commit command; calls succeed by default."""
+    mock_run = MagicMock(return_value=MagicMock(returncode=0))
+    monkeypatch.setattr('py_opencommit.commands.commit.subprocess.run', mock_run)
+    return mock_run
+
+
 @pytest.fixture
 def mock_litellm():
     """Mock LiteLLM API response."""
@@ -71,39 +92,69 @@ def mock_litellm():
         yield mock_response
 
 
+@pytest.fixture(scope="session")
+def session_loop():
+    """Return one event loop shared by every test that runs coroutines."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
 @pytest.fixture
-def temp_global_config_file():
+def engine_config():
+    """Return a basic AI engine configuration."""
+    return AiEngineConfig(
+        api_key="test-api-key",
+        model="gpt-3.5-turbo",
+        max_tokens_output=500,
+        max_tokens_input=4000
+    )
+
+
+@pytest.fixture
+def mock_async_openai():
+    """Mock the AsyncOpenAI client class used by the OpenAI engine."""
+    with patch('py_opencommit.engine.openai.AsyncOpenAI') as mock_openai_class:
+        yield mock_openai_class
+
+
+@pytest.fixture
+def openai_engine(mock_async_openai, engine_config):
+    """Return an OpenAiEngine whose client's completions.create is an AsyncMock."""
+    from py_opencommit.engine.openai import OpenAiEngine
+
+    engine = OpenAiEngine(engine_config)
+    engine.client.chat.completions.create = AsyncMock()
+    return engine
+
+
+@pytest.fixture
+def temp_global_config_file(tmp_path):
     """Create a temporary global config file."""
-    with tempfile.NamedTemporaryFile(delete=False, mode='w+') as f:
-        f.write("[DEFAULT]\n")
-        f.write("OCO_API_KEY = test-api-key\n")
-        f.write("OCO_MODEL = gpt-3.5-turbo\n")
-        f.write("OCO_EMOJI = true\n")
-        temp_path = f.name
-    
-    with patch('py_opencommit.commands.config.get_global_config_path', return_value=Path(temp_path)):
-        yield temp_path
-    
-    # Clean up
-    if os.path.exists(temp_path):
-        os.unlink(temp_path)
+    config_path = tmp_path / "global.cfg"
+    config_path.write_text(
+        "[DEFAULT]\n"
+        "OCO_API_KEY = test-api-key\n"
+        "OCO_MODEL = gpt-3.5-turbo\n"
+        "OCO_EMOJI = true\n"
+    )
+
+    with patch('py_opencommit.commands.config.get_global_config_path', return_value=config_path):
+        yield str(config_path)
 
 
 @pytest.fixture
-def temp_project_config_file():
+def temp_project_config_file(tmp_path):
     """Create a temporary project config file (.env)."""
-    with tempfile.NamedTemporaryFile(delete=False, mode='w+') as f:
-        f.write("OCO_API_KEY=project-api-key\n")
-        f.write("OCO_MODEL=gpt-4\n")
-        f.write("OCO_WHY=true\n")
-        temp_path = f.name
-    
-    with patch('py_opencommit.commands.config.get_project_config_path', return_value=Path(temp_path)):
-        yield temp_path
-    
-    # Clean up
-    if os.path.exists(temp_path):
-        os.unlink(temp_path)
+    config_path = tmp_path / ".env"
+    config_path.write_text(
+        "OCO_API_KEY=project-api-key\n"
+        "OCO_MODEL=gpt-4\n"
+        "OCO_WHY=true\n"
+    )
+
+    with patch('py_opencommit.commands.config.get_project_config_path', return_value=config_path):
+        yield str(config_path)
 
 
 @pytest.fixture
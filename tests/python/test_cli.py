@@ -1,18 +1,11 @@
 """Tests for the OpenCommit CLI."""
 
-import pytest
 import os
 from unittest import mock
-from click.testing import CliRunner
 from py_opencommit.cli import cli, main
 from py_opencommit.i18n import get_text, load_translations
 
 
-@pytest.fixture
-def runner():
-    return CliRunner()
-
-
 def test_cli_help(runner):
     """Test the CLI help output."""
     result = runner.invoke(cli, ["--help"])
@@ -72,19 +65,28 @@ def test_commit_command_with_options(runner):
             ['-a'],             # extra_args
             'Testing context',  # context
             'true',             # stage_all
-            'true'              # skip_confirm
+            'true',             # skip_confirm
+            stream=False
         )
 
 
+def test_commit_command_stream(runner):
+    """Test commit command with streaming enabled."""
+    with mock.patch('py_opencommit.commands.commit.commit') as mock_commit:
+        result = runner.invoke(cli, ["commit", "--stream"])
+        assert result.exit_code == 0
+        assert mock_commit.call_args.kwargs["stream"] is True
+
+
 def test_commit_command_error(runner):
     """Test commit command error handling."""
-    with mock.patch('py_opencommit.commands.commit.commit', side_effect=Exception("Test error")):
-        with mock.patch('py_opencommit.cli.console.print') as mock_print:
-            with mock.patch('py_opencommit.cli.get_language_from_alias', return_value=None):
-                result = runner.invoke(cli, ["commit"])
-                assert result.exit_code == 1
-                assert mock_print.call_count > 0
-                assert any("Test error" in str(call.args[0]) for call in mock_print.call_args_list)
+    with mock.patch('py_opencommit.commands.commit.commit', side_effect=Exception("Test error")), \
+         mock.patch('py_opencommit.cli.console.print') as mock_print, \
+         mock.patch('py_opencommit.cli.get_language_from_alias', return_value=None):
+        result = runner.invoke(cli, ["commit"])
+    assert result.exit_code == 1
+    assert mock_print.call_count > 0
+    assert any("Test error" in str(call.args[0]) for call in mock_print.call_args_list)
 
 
 def test_config_get_command(runner):
@@ -122,13 +124,13 @@ def test_config_set_project_command(runner):
 
 def test_config_command_error(runner):
     """Test config command error handling."""
-    with mock.patch('py_opencommit.commands.config.config', side_effect=Exception("Test error")):
-        with mock.patch('py_opencommit.cli.console.print') as mock_print:
-            with mock.patch('py_opencommit.cli.get_language_from_alias', return_value=None):
-                result = runner.invoke(cli, ["config", "get"])
-                assert result.exit_code == 1
-                assert mock_print.call_count > 0
-                assert any("Test error" in str(call.args[0]) for call in mock_print.call_args_list)
+    with mock.patch('py_opencommit.commands.config.config', side_effect=Exception("Test error")), \
+         mock.patch('py_opencommit.cli.console.print') as mock_print, \
+         mock.patch('py_opencommit.cli.get_language_from_alias', return_value=None):
+        result = runner.invoke(cli, ["config", "get"])
+    assert result.exit_code == 1
+    assert mock_print.call_count > 0
+    assert any("Test error" in str(call.args[0]) for call in mock_print.call_args_list)
 
 
 def test_githook_command(runner):
@@ -141,13 +143,13 @@ def test_githook_command(runner):
 
 def test_githook_command_error(runner):
     """Test githook command error handling."""
-    with mock.patch('py_opencommit.commands.githook.githook', side_effect=Exception("Test error")):
-        with mock.patch('py_opencommit.cli.console.print') as mock_print:
-            with mock.patch('py_opencommit.cli.get_language_from_alias', return_value=None):
-                result = runner.invoke(cli, ["githook"])
-                assert result.exit_code == 1
-                assert mock_print.call_count > 0
-                assert any("Test error" in str(call.args[0]) for call in mock_print.call_args_list)
+    with mock.patch('py_opencommit.commands.githook.githook', side_effect=Exception("Test error")), \
+         mock.patch('py_opencommit.cli.console.print') as mock_print, \
+         mock.patch('py_opencommit.cli.get_language_from_alias', return_value=None):
+        result = runner.invoke(cli, ["githook"])
+    assert result.exit_code == 1
+    assert mock_print.call_count > 0
+    assert any("Test error" in str(call.args[0]) for call in mock_print.call_args_list)
 
 
 def test_main_function():
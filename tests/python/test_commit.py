@@ -1,11 +1,13 @@
 """Tests for the OpenCommit commit command."""
 
+import asyncio
 import pytest
 import sys
 import subprocess
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 from rich.console import Console
 from py_opencommit.commands.commit import (
+    _sanitize_scalars,
     generate_commit_message,
     check_message_template,
     apply_template,
@@ -50,59 +52,39 @@ def test_apply_template():
     assert result == "Subject: Test commit message\n\nDetails go here"
 
 
-def test_run_git_commit():
+def test_run_git_commit(mock_subprocess_run):
     """Test run_git_commit function."""
-    with patch('subprocess.run') as mock_run:
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_run.return_value = mock_result
-        
-        # Test successful commit
-        result = run_git_commit("Test message", ["-a", "--no-verify"])
-        assert result is True
-        mock_run.assert_called_once()
-        assert mock_run.call_args[0][0][0:3] == ["git", "commit", "-m"]
-        assert mock_run.call_args[0][0][3] == "Test message"
-        assert "-a" in mock_run.call_args[0][0]
-        assert "--no-verify" in mock_run.call_args[0][0]
-        
-        # Test filtering template args
-        mock_run.reset_mock()
-        mock_run.return_value = mock_result
-        result = run_git_commit("Test message", ["-a", f"--template-msg={DEFAULT_TEMPLATE_PLACEHOLDER}"])
-        assert result is True
-        mock_run.assert_called_once()
-        assert mock_run.call_args[0][0][0:3] == ["git", "commit", "-m"]
-        assert mock_run.call_args[0][0][3] == "Test message"
-        assert "-a" in mock_run.call_args[0][0]
-        assert f"--template-msg={DEFAULT_TEMPLATE_PLACEHOLDER}" not in mock_run.call_args[0][0]
-        
-        # Test commit failure
-        mock_run.reset_mock()
-        mock_run.side_effect = subprocess.CalledProcessError(1, "git commit", stderr="Git error")
-        with pytest.raises(RuntimeError):
-            run_git_commit("Test message", [])
+    mock_run = mock_subprocess_run
+
+    # Test successful commit
+    result = run_git_commit("Test message", ["-a", "--no-verify"])
+    assert result is True
+    mock_run.assert_called_once()
+    assert mock_run.call_args[0][0][0:4] == ["git", "commit", "-F", "-"]
+    assert mock_run.call_args[1]["input"] == b"Test message"
+    assert "-a" in mock_run.call_args[0][0]
+    assert "--no-verify" in mock_run.call_args[0][0]
 
+    # Test filtering template args
+    mock_run.reset_mock()
+    result = run_git_commit("Test message", ["-a", f"--template-msg={DEFAULT_TEMPLATE_PLACEHOLDER}"])
+    assert result is True
+    mock_run.assert_called_once()
+    assert mock_run.call_args[0][0][0:4] == ["git", "commit", "-F", "-"]
+    assert mock_run.call_args[1]["input"] == b"Test message"
+    assert "-a" in mock_run.call_args[0][0]
+    assert f"--template-msg={DEFAULT_TEMPLATE_PLACEHOLDER}" not in mock_run.call_args[0][0]
 
-def test_split_diff_by_files():
+    # Test commit failure
+    mock_run.reset_mock()
+    mock_run.side_effect = subprocess.CalledProcessError(1, "git commit", stderr="Git error")
+    with pytest.raises(RuntimeError):
+        run_git_commit("Test message", [])
+
+
+def test_split_diff_by_files(staged_diff_text):
     """Test split_diff_by_files function."""
-    diff = """diff --git a/file1.txt b/file1.txt
-index 1234567..abcdef 100644
---- a/file1.txt
-+++ b/file1.txt
-@@ -1,3 +1,4 @@
- line1
- line2
-+line3
-diff --git a/file2.txt b/file2.txt
-index 9876543..fedcba 100644
---- a/file2.txt
-+++ b/file2.txt
-@@ -1,2 +1 @@
--line1
- line2"""
-    
-    result = split_diff_by_files(diff)
+    result = split_diff_by_files(staged_diff_text)
     assert len(result) == 2
     assert "file1.txt" in result
     assert "file2.txt" in result
@@ -110,6 +92,14 @@ index 9876543..fedcba 100644
     assert "-line1" in result["file2.txt"]
 
 
+def test_sanitize_scalars():
+    """Test that only top-level booleans are converted."""
+    messages = [{"role": "user", "content": "diff"}]
+    result = _sanitize_scalars({"stream": True, "max_tokens": 10, "messages": messages})
+    assert result == {"stream": "true", "max_tokens": 10, "messages": messages}
+    assert result["messages"] is messages
+
+
 def test_chunk_diff(mock_staged_diff):
     """Test chunk_diff function."""
     with patch('py_opencommit.commands.commit.token_count', return_value=100):
@@ -118,9 +108,12 @@ def test_chunk_diff(mock_staged_diff):
         assert len(chunks) == 1
         assert chunks[0] == mock_staged_diff
     
-    with patch('py_opencommit.commands.commit.token_count') as mock_token_count:
+    with patch('py_opencommit.commands.commit.token_count') as mock_token_count, \
+         patch('py_opencommit.commands.commit.token_count_batch') as mock_token_count_batch:
         # Simulate large diff requiring chunking
-        mock_token_count.side_effect = lambda text: 5000 if text == mock_staged_diff else 1000
+        token_map = {mock_staged_diff: 50}
+        mock_token_count.side_effect = lambda text: token_map.get(text, 10)
+        mock_token_count_batch.side_effect = lambda texts: [10] * len(texts)
         
         with patch('py_opencommit.commands.commit.split_diff_by_files') as mock_split:
             file_diffs = {
@@ -130,12 +123,58 @@ def test_chunk_diff(mock_staged_diff):
             mock_split.return_value = file_diffs
             
             # Updated keyword argument from max_tokens to max_tokens_per_chunk
-            chunks = chunk_diff(mock_staged_diff, max_tokens_per_chunk=1500)
+            chunks = chunk_diff(mock_staged_diff, max_tokens_per_chunk=15)
             assert len(chunks) == 2
             assert chunks[0] == "diff for file1"
             assert chunks[1] == "diff for file2"
 
 
+def test_chunk_diff_splits_large_file_by_hunks():
+    """Test that an oversized file diff is split into hunks without losing the last one."""
+    file_diff = (
+        "diff --git a/big.py b/big.py\n"
+        "--- a/big.py\n"
+        "+++ b/big.py\n"
+        "@@ -1,1 +1,1 @@\n"
+        "-one\n"
+        "+ONE\n"
+        "@@ -10,1 +10,1 @@\n"
+        "-two\n"
+        "+TWO"
+    )
+    with patch('py_opencommit.commands.commit.token_count', return_value=50), \
+         patch('py_opencommit.commands.commit.token_count_batch',
+               side_effect=lambda texts: [50] * len(texts) if len(texts) == 1 else [10] * len(texts)):
+        chunks = chunk_diff(file_diff, max_tokens_per_chunk=15)
+
+    assert chunks == [
+        "diff --git a/big.py b/big.py\n--- a/big.py\n+++ b/big.py\n@@ -1,1 +1,1 @@\n-one\n+ONE",
+        "@@ -10,1 +10,1 @@\n-two\n+TWO",
+    ]
+
+
+def test_chunk_diff_truncates_by_tokens():
+    """Test that an oversized hunk is cut at a token boundary rather than by characters."""
+    file_diff = "diff --git a/big.py b/big.py\n@@ -1,1 +1,1 @@\n+" + "x" * 100
+    with patch('py_opencommit.commands.commit.token_count', return_value=50), \
+         patch('py_opencommit.commands.commit.token_count_batch', side_effect=lambda texts: [50] * len(texts)), \
+         patch('py_opencommit.commands.commit.encode', return_value=list(range(50))) as mock_encode, \
+         patch('py_opencommit.commands.commit.decode', side_effect=lambda tokens: f"<{len(tokens)} tokens>"):
+        chunks = chunk_diff(file_diff, max_tokens_per_chunk=30)
+
+    mock_encode.assert_called_once_with(file_diff)
+    assert chunks == ["<14 tokens>\n# ... (hunk truncated)"]
+
+
+def test_chunk_diff_skips_tokenizer_for_small_diff(mock_staged_diff):
+    """Test that a diff with fewer bytes than the token limit is returned without tokenizing."""
+    with patch('py_opencommit.commands.commit.token_count') as mock_token_count:
+        chunks = chunk_diff(mock_staged_diff, max_tokens_per_chunk=len(mock_staged_diff))
+
+    mock_token_count.assert_not_called()
+    assert chunks == [mock_staged_diff]
+
+
 def test_create_commit_prompt():
     """Test create_commit_prompt function."""
     diff = "Test diff content"
@@ -156,6 +195,80 @@ def test_create_commit_prompt():
     assert context in messages[0]["content"]
 
 
+def test_create_commit_prompt_cache_control():
+    """Test that Anthropic prompts mark the static system prefix for caching."""
+    from py_opencommit.modules.commitlint.prompts import _is_cacheable_prefix
+
+    diff = "diff --git a/app/server.py b/app/server.py\n+print('hi')\n" + "+x\n" * 512
+    other_diff = "diff --git a/other.py b/other.py\n+pass\n" + "+x\n" * 512
+    _is_cacheable_prefix.cache_clear()
+    with patch('py_opencommit.modules.commitlint.prompts.CACHE_CONTROL', True), \
+         patch('py_opencommit.modules.commitlint.prompts.token_count', return_value=2000):
+        first = create_commit_prompt(diff, "some context")
+        second = create_commit_prompt(other_diff)
+    _is_cacheable_prefix.cache_clear()
+
+    static_block, dynamic_block = first[0]["content"]
+    assert static_block["cache_control"] == {"type": "ephemeral"}
+    assert "app/server.py" not in static_block["text"]
+    assert "app/server.py" in dynamic_block["text"]
+    assert "some context" in dynamic_block["text"]
+    assert second[0]["content"][0] == static_block
+
+
+def test_create_commit_prompt_skips_cache_control_below_minimum():
+    """Test that a prefix too short for Anthropic's cache is sent as plain text."""
+    from py_opencommit.modules.commitlint.prompts import _is_cacheable_prefix
+
+    diff = "diff --git a/app/server.py b/app/server.py\n+print('hi')\n" + "+x\n" * 512
+    _is_cacheable_prefix.cache_clear()
+    with patch('py_opencommit.modules.commitlint.prompts.CACHE_CONTROL', True), \
+         patch('py_opencommit.modules.commitlint.prompts.token_count', return_value=500):
+        messages = create_commit_prompt(diff)
+    _is_cacheable_prefix.cache_clear()
+
+    assert isinstance(messages[0]["content"], str)
+    assert "app/server.py" in messages[0]["content"]
+
+
+def test_create_commit_prompt_minimal_for_small_diff():
+    """Test that a small single-file diff gets the compact system prompt."""
+    small_diff = "diff --git a/README.md b/README.md\n-teh\n+the"
+    large_diff = small_diff + "\n+" + "x" * 1024
+
+    small_system = create_commit_prompt(small_diff)[0]["content"]
+    large_system = create_commit_prompt(large_diff)[0]["content"]
+
+    assert "Examples" not in small_system
+    assert "Examples" in large_system
+    assert "README.md" in small_system
+    assert len(small_system) < len(large_system)
+
+
+def test_create_commit_prompt_minimal_skips_cache_control():
+    """Test that the compact prompt is sent as plain text even for Anthropic."""
+    small_diff = "diff --git a/README.md b/README.md\n-teh\n+the"
+    with patch('py_opencommit.modules.commitlint.prompts.CACHE_CONTROL', True), \
+         patch('py_opencommit.modules.commitlint.prompts.token_count') as mock_token_count:
+        system = create_commit_prompt(small_diff)[0]["content"]
+
+    assert isinstance(system, str)
+    assert "Examples" not in system
+    mock_token_count.assert_not_called()
+
+
+def test_create_commit_prompt_minimal_threshold_counts_bytes():
+    """Test that the minimal prompt threshold is measured in UTF-8 bytes."""
+    from py_opencommit.modules.commitlint.prompts import MINIMAL_PROMPT_THRESHOLD
+
+    # Fewer characters than the threshold, but more bytes
+    diff = "diff --git a/README.md b/README.md\n+" + "é" * (MINIMAL_PROMPT_THRESHOLD // 2)
+    assert len(diff) < MINIMAL_PROMPT_THRESHOLD <= len(diff.encode("utf-8"))
+
+    system = create_commit_prompt(diff)[0]["content"]
+    assert "Examples" in system
+
+
 def test_generate_commit_message(mock_litellm):
     """Test generate_commit_message function."""
     diff = "Test diff content"
@@ -174,7 +287,8 @@ def test_generate_commit_message(mock_litellm):
             generate_commit_message(diff)
 
 
-def test_commit_command_components(mock_git_repo, mock_staged_diff, mock_staged_files, mock_litellm):
+def test_commit_command_components(mock_git_repo, mock_staged_diff, mock_staged_files, mock_litellm,
+                                   mock_subprocess_run):
     """Test components of the commit command."""
     # Test message generation
     message = generate_commit_message(mock_staged_diff)
@@ -189,7 +303,123 @@ def test_commit_command_components(mock_git_repo, mock_staged_diff, mock_staged_
     assert formatted_message is not None
     
     # Test commit execution with mocks
-    with patch('subprocess.run') as mock_run:
-        mock_run.return_value.returncode = 0
-        result = run_git_commit(message, [])
-        assert result is True
+    result = run_git_commit(message, [])
+    assert result is True
+    mock_subprocess_run.assert_called_once()
+
+
+def test_generate_commit_message_streams():
+    """Test that streamed completions are accumulated into the message."""
+    def make_chunk(text):
+        chunk = MagicMock()
+        chunk.choices[0].delta.content = text
+        return chunk
+
+    chunks = [make_chunk("feat: "), make_chunk(None), make_chunk("add x")]
+    with patch('litellm.completion', return_value=iter(chunks)) as mock_completion, \
+         patch('py_opencommit.commands.commit.token_count', return_value=100), \
+         patch('py_opencommit.commands.commit.console'):
+        message = generate_commit_message("diff --git a/x b/x\n+x", staged_files=["x"], stream=True)
+
+    assert message == "feat: add x"
+    assert mock_completion.call_args.kwargs["stream"] is True
+
+
+def test_generate_commit_message_chunks_concurrently():
+    """Test that multi-chunk diffs issue their requests concurrently and keep chunk order."""
+    def make_response(text):
+        response = MagicMock()
+        response.choices[0].message.content = text
+        return response
+
+    in_flight = 0
+    max_in_flight = 0
+
+    async def fake_acompletion(**kwargs):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return make_response("message for " + kwargs["messages"][0]["content"])
+
+    with patch('litellm.acompletion', new=AsyncMock(side_effect=fake_acompletion)), \
+         patch('litellm.completion', return_value=make_response("feat: summary")) as mock_completion, \
+         patch('py_opencommit.commands.commit.chunk_diff', return_value=["diff 1", "diff 2", "diff 3"]), \
+         patch('py_opencommit.commands.commit.create_commit_prompt', side_effect=lambda d, c: [{"role": "user", "content": d}]), \
+         patch('py_opencommit.commands.commit.token_count', return_value=100), \
+         patch('py_opencommit.commands.commit.console'):
+        message = generate_commit_message("diff", staged_files=["x"])
+
+    assert message == "feat: summary"
+    assert max_in_flight > 1
+    # The partial messages reach the summary request in chunk order
+    summary_input = mock_completion.call_args.kwargs["messages"][-1]["content"]
+    assert summary_input.endswith("message for diff 1\n\nmessage for diff 2\n\nmessage for diff 3")
+
+
+def test_generate_commit_message_resplits_on_context_error():
+    """Test that a hunk-only chunk rejected for context length is re-split, not dropped."""
+    first_chunk = (
+        "diff --git a/big.py b/big.py\n"
+        "--- a/big.py\n"
+        "+++ b/big.py\n"
+        "@@ -1,1 +1,1 @@\n"
+        "-a\n"
+        "+b"
+    )
+    # A later piece of the same file: hunks only, no diff --git header.
+    # Together the hunks exceed the context limit, but each fits on its own
+    padding = " ".join(["+x"] * 8)
+    hunk_chunk = (
+        "@@ -4,1 +4,1 @@\n"
+        f"-c\n+d {padding}\n"
+        "@@ -8,1 +8,1 @@\n"
+        f"-e\n+f {padding}"
+    )
+    context_limit = 20
+
+    def make_response(text):
+        response = MagicMock()
+        response.choices[0].message.content = text
+        return response
+
+    def fake_token_count(text):
+        return len(text.split())
+
+    async def fake_acompletion(**kwargs):
+        content = kwargs["messages"][0]["content"]
+        if fake_token_count(content) > context_limit:
+            raise Exception(f"This model's maximum context length is {context_limit} tokens")
+        return make_response(f"msg<{content.splitlines()[0]}>")
+
+    def fake_chunk_diff(diff, max_tokens_per_chunk=None):
+        # The initial split is stubbed; re-splits go through the real chunk_diff
+        if diff == "whole diff":
+            return [first_chunk, hunk_chunk]
+        return chunk_diff(diff, max_tokens_per_chunk=max_tokens_per_chunk)
+
+    with patch('litellm.acompletion', new=AsyncMock(side_effect=fake_acompletion)), \
+         patch('litellm.completion', side_effect=Exception("no summary")), \
+         patch('py_opencommit.commands.commit.chunk_diff', side_effect=fake_chunk_diff), \
+         patch('py_opencommit.commands.commit.create_commit_prompt', side_effect=lambda d, c: [{"role": "user", "content": d}]), \
+         patch('py_opencommit.commands.commit.token_count', side_effect=fake_token_count), \
+         patch('py_opencommit.commands.commit.token_count_batch', side_effect=lambda texts: [fake_token_count(t) for t in texts]), \
+         patch('py_opencommit.commands.commit.MIN_RETRY_CHUNK_TOKENS', 4), \
+         patch('py_opencommit.commands.commit.console'):
+        message = generate_commit_message("whole diff", staged_files=["big.py"])
+
+    sub_messages = message.split("\n\n")
+    assert all(sub_messages)
+    assert sub_messages[0] == "msg<diff --git a/big.py b/big.py>"
+    assert "msg<@@ -4,1 +4,1 @@>" in sub_messages
+    assert "msg<@@ -8,1 +8,1 @@>" in sub_messages
+
+
+def test_generate_commit_message_reuses_staged_files(mock_litellm):
+    """Test that generate_commit_message doesn't re-query git when given staged files."""
+    with patch('py_opencommit.commands.commit.token_count', return_value=100), \
+         patch('py_opencommit.commands.commit.get_staged_files') as mock_get_staged:
+        message = generate_commit_message("Test diff content", staged_files=["file1.txt"])
+        assert message == "Add feature: implement new functionality"
+        mock_get_staged.assert_not_called()
@@ -1,8 +1,6 @@
 """Tests for configuration management."""
 
-import os
 import json
-import tempfile
 from pathlib import Path
 from unittest import mock
 import pytest
@@ -35,7 +33,8 @@ from py_opencommit.commands.config import (
     parse_config_value,
     get_completed_migrations,
     save_completed_migration,
-    get_migrations_file_path
+    get_migrations_file_path,
+    _parse_global_config,
 )
 
 
@@ -48,6 +47,21 @@ def test_get_global_config(temp_global_config_file):
         assert config["OCO_EMOJI"] is True
 
 
+def test_get_global_config_cached(temp_global_config_file):
+    """Test that the global config is re-parsed only after the file changes."""
+    with mock.patch('py_opencommit.commands.config._parse_global_config',
+                    wraps=_parse_global_config) as mock_parse:
+        first = get_global_config()
+        first["OCO_MODEL"] = "changed"
+        assert get_global_config()["OCO_MODEL"] == "gpt-3.5-turbo"
+        assert mock_parse.call_count == 1
+
+        with open(temp_global_config_file, 'a') as f:
+            f.write("OCO_WHY = true\n")
+        assert get_global_config()["OCO_WHY"] is True
+        assert mock_parse.call_count == 2
+
+
 def test_get_project_config(temp_project_config_file):
     """Test getting project configuration."""
     with mock.patch('py_opencommit.commands.config.get_project_config_path', return_value=Path(temp_project_config_file)):
@@ -100,54 +114,54 @@ def test_validate_configs():
     assert "OCO_MODEL" in validated
 
 
-def test_validate_boolean():
+@pytest.mark.parametrize("value,expected", [
+    # Boolean inputs
+    (True, True),
+    (False, False),
+    # String inputs
+    ("true", True),
+    ("True", True),
+    ("yes", True),
+    ("1", True),
+    ("y", True),
+    ("false", False),
+    ("False", False),
+    ("no", False),
+    ("0", False),
+    ("n", False),
+])
+def test_validate_boolean(value, expected):
     """Test boolean value validation."""
-    # Test boolean inputs
-    assert validate_boolean("OCO_EMOJI", True) is True
-    assert validate_boolean("OCO_EMOJI", False) is False
-    
-    # Test string inputs
-    assert validate_boolean("OCO_EMOJI", "true") is True
-    assert validate_boolean("OCO_EMOJI", "True") is True
-    assert validate_boolean("OCO_EMOJI", "yes") is True
-    assert validate_boolean("OCO_EMOJI", "1") is True
-    assert validate_boolean("OCO_EMOJI", "y") is True
-    
-    assert validate_boolean("OCO_EMOJI", "false") is False
-    assert validate_boolean("OCO_EMOJI", "False") is False
-    assert validate_boolean("OCO_EMOJI", "no") is False
-    assert validate_boolean("OCO_EMOJI", "0") is False
-    assert validate_boolean("OCO_EMOJI", "n") is False
-    
-    # Test invalid inputs
-    with pytest.raises(ValueError):
-        validate_boolean("OCO_EMOJI", "invalid")
-    
-    with pytest.raises(ValueError):
-        validate_boolean("OCO_EMOJI", 123)
+    assert validate_boolean("OCO_EMOJI", value) is expected
 
 
-def test_validate_integer():
-    """Test integer value validation."""
-    # Test integer inputs
-    assert validate_integer("OCO_TOKENS_MAX_INPUT", 1000) == 1000
-    assert validate_integer("OCO_TOKENS_MAX_INPUT", 0) == 0
-    assert validate_integer("OCO_TOKENS_MAX_INPUT", -10) == -10
-    
-    # Test string inputs
-    assert validate_integer("OCO_TOKENS_MAX_INPUT", "1000") == 1000
-    assert validate_integer("OCO_TOKENS_MAX_INPUT", "0") == 0
-    assert validate_integer("OCO_TOKENS_MAX_INPUT", "-10") == -10
-    
-    # Test invalid inputs
-    with pytest.raises(ValueError):
-        validate_integer("OCO_TOKENS_MAX_INPUT", "invalid")
-    
+@pytest.mark.parametrize("value", ["invalid", 123])
+def test_validate_boolean_invalid(value):
+    """Test that invalid boolean values are rejected."""
     with pytest.raises(ValueError):
-        validate_integer("OCO_TOKENS_MAX_INPUT", "1.5")
-    
+        validate_boolean("OCO_EMOJI", value)
+
+
+@pytest.mark.parametrize("value,expected", [
+    # Integer inputs
+    (1000, 1000),
+    (0, 0),
+    (-10, -10),
+    # String inputs
+    ("1000", 1000),
+    ("0", 0),
+    ("-10", -10),
+])
+def test_validate_integer(value, expected):
+    """Test integer value validation."""
+    assert validate_integer("OCO_TOKENS_MAX_INPUT", value) == expected
+
+
+@pytest.mark.parametrize("value", ["invalid", "1.5", None])
+def test_validate_integer_invalid(value):
+    """Test that invalid integer values are rejected."""
     with pytest.raises(ValueError):
-        validate_integer("OCO_TOKENS_MAX_INPUT", None)
+        validate_integer("OCO_TOKENS_MAX_INPUT", value)
 
 
 def test_validate_model():
@@ -195,19 +209,22 @@ def test_validate_prompt_module():
         validate_prompt_module(123)
 
 
-def test_validate_ai_provider():
+@pytest.mark.parametrize("value,expected", [
+    ("openai", "openai"),
+    ("anthropic", "anthropic"),
+    ("gemini", "gemini"),
+    ("mistral", "mistral"),
+    ("ollama", "ollama"),
+    # Empty provider, should use default
+    ("", "openai"),
+])
+def test_validate_ai_provider(value, expected):
     """Test AI provider validation."""
-    # Test valid providers
-    assert validate_ai_provider("openai") == "openai"
-    assert validate_ai_provider("anthropic") == "anthropic"
-    assert validate_ai_provider("gemini") == "gemini"
-    assert validate_ai_provider("mistral") == "mistral"
-    assert validate_ai_provider("ollama") == "ollama"
-    
-    # Test empty provider, should use default
-    assert validate_ai_provider("") == "openai"
-    
-    # Test invalid providers
+    assert validate_ai_provider(value) == expected
+
+
+def test_validate_ai_provider_invalid():
+    """Test that unknown AI providers are rejected."""
     with pytest.raises(ValueError):
         validate_ai_provider("invalid-provider")
 
@@ -257,24 +274,19 @@ def test_get_config_precedence(temp_global_config_file, temp_project_config_file
         assert "OCO_TOKENS_MAX_INPUT" in config
 
 
-def test_set_global_config():
+def test_set_global_config(tmp_path):
     """Test setting global configuration."""
-    with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-        temp_path = temp_file.name
+    config_path = tmp_path / ".pyoc"
     
-    try:
-        with mock.patch('py_opencommit.commands.config.get_global_config_path', return_value=Path(temp_path)):
-            set_global_config("OCO_API_KEY", "new-api-key")
-            set_global_config("OCO_MODEL", "gpt-4")
-            
-            # Read the file directly to verify
-            config_parser = ConfigParser()
-            config_parser.read(temp_path)
-            assert config_parser['DEFAULT']['oco_api_key'] == 'new-api-key'
-            assert config_parser['DEFAULT']['oco_model'] == 'gpt-4'
-    finally:
-        if os.path.exists(temp_path):
-            os.unlink(temp_path)
+    with mock.patch('py_opencommit.commands.config.get_global_config_path', return_value=config_path):
+        set_global_config("OCO_API_KEY", "new-api-key")
+        set_global_config("OCO_MODEL", "gpt-4")
+        
+        # Read the file directly to verify
+        config_parser = ConfigParser()
+        config_parser.read(config_path)
+        assert config_parser['DEFAULT']['oco_api_key'] == 'new-api-key'
+        assert config_parser['DEFAULT']['oco_model'] == 'gpt-4'
 
 
 def test_set_project_config():
@@ -385,39 +397,26 @@ def test_migration_runner():
                     assert TestMigration.was_run is True
 
 
-def test_get_completed_migrations():
+def test_get_completed_migrations(tmp_path):
     """Test getting completed migrations."""
-    with tempfile.NamedTemporaryFile(delete=False, mode='w+') as temp_file:
-        json.dump(["migration1", "migration2"], temp_file)
-        temp_file.flush()
-        temp_path = temp_file.name
+    migrations_path = tmp_path / "migrations.json"
+    migrations_path.write_text(json.dumps(["migration1", "migration2"]))
     
-    try:
-        with mock.patch('py_opencommit.commands.config.get_migrations_file_path', return_value=Path(temp_path)):
-            migrations = get_completed_migrations()
-            assert "migration1" in migrations
-            assert "migration2" in migrations
-    finally:
-        if os.path.exists(temp_path):
-            os.unlink(temp_path)
+    with mock.patch('py_opencommit.commands.config.get_migrations_file_path', return_value=migrations_path):
+        migrations = get_completed_migrations()
+        assert "migration1" in migrations
+        assert "migration2" in migrations
 
 
-def test_save_completed_migration():
+def test_save_completed_migration(tmp_path):
     """Test saving completed migrations."""
-    with tempfile.NamedTemporaryFile(delete=False, mode='w+') as temp_file:
-        json.dump(["existing_migration"], temp_file)
-        temp_file.flush()
-        temp_path = temp_file.name
+    migrations_path = tmp_path / "migrations.json"
+    migrations_path.write_text(json.dumps(["existing_migration"]))
     
-    try:
-        with mock.patch('py_opencommit.commands.config.get_migrations_file_path', return_value=Path(temp_path)):
-            save_completed_migration("new_migration")
-            
-            # Read the file directly to verify
-            with open(temp_path, 'r') as f:
-                migrations = json.load(f)
-                assert "existing_migration" in migrations
-                assert "new_migration" in migrations
-    finally:
-        if os.path.exists(temp_path):
-            os.unlink(temp_path)
+    with mock.patch('py_opencommit.commands.config.get_migrations_file_path', return_value=migrations_path):
+        save_completed_migration("new_migration")
+        
+        # Read the file directly to verify
+        migrations = json.loads(migrations_path.read_text())
+        assert "existing_migration" in migrations
+        assert "new_migration" in migrations
@@ -7,7 +7,7 @@ import shutil
 import subprocess
 import pytest
 from pathlib import Path
-from unittest.mock import patch, MagicMock, call
+from unittest.mock import patch, MagicMock
 
 
 from py_opencommit.utils.git import (
@@ -17,11 +17,13 @@ from py_opencommit.utils.git import (
     assert_git_repo,
     get_staged_files,
     get_changed_files,
+    get_status_files,
     get_staged_diff,
     split_diff_by_files,
     merge_diffs,
     stage_files,
     stage_all_changes,
+    stage_all_if_needed,
     get_commit_template,
     apply_commit_template,
     commit,
@@ -34,6 +36,10 @@ from py_opencommit.utils.git import (
 
 class TestGitUtils:
     
+    def setup_method(self):
+        """Forget any git root cached by a previous test."""
+        get_git_root.cache_clear()
+    
     def test_git_error_class(self):
         """Test the GitError exception class."""
         error = GitError("Test error message")
@@ -44,17 +50,19 @@ class TestGitUtils:
         """Test the _run_git_command helper with mocked subprocess."""
         with patch('subprocess.run') as mock_run:
             mock_result = MagicMock()
-            mock_result.stdout = "test output"
+            mock_result.stdout = "test output ✓".encode("utf-8")
+            mock_result.stderr = b""
             mock_run.return_value = mock_result
             
             result = _run_git_command(["git", "status"])
-            assert result.stdout == "test output"
+            assert result.stdout == "test output ✓"
+            assert result.stderr == ""
             mock_run.assert_called_once()
     
     def test_run_git_command_error(self):
         """Test _run_git_command error handling."""
         with patch('subprocess.run') as mock_run:
-            mock_run.side_effect = subprocess.CalledProcessError(1, "git", stderr="fatal: not a git repository")
+            mock_run.side_effect = subprocess.CalledProcessError(1, "git", stderr=b"fatal: not a git repository")
             
             with pytest.raises(GitError) as excinfo:
                 _run_git_command(["git", "status"])
@@ -94,6 +102,9 @@ class TestGitUtils:
             
             result = get_git_root()
             assert result == "/path/to/repo"
+            
+            # The root is cached after the first lookup
+            assert get_git_root() == "/path/to/repo"
             mock_cmd.assert_called_once_with(["git", "rev-parse", "--show-toplevel"])
     
     def test_get_git_root_error(self):
@@ -132,26 +143,52 @@ class TestGitUtils:
         """Test getting staged files."""
         with patch('py_opencommit.utils.git._run_git_command') as mock_cmd:
             mock_result = MagicMock()
-            mock_result.stdout = "file1.txt\nfile2.txt\ndir/file3.txt\n"
+            mock_result.stdout = "file1.txt\0file2.txt\0dir/file 3\u00e9.txt\0"
             mock_cmd.return_value = mock_result
             
             result = get_staged_files()
-            assert result == ["file1.txt", "file2.txt", "dir/file3.txt"]
-            mock_cmd.assert_called_once_with(["git", "diff", "--name-only", "--cached"])
+            assert result == ["file1.txt", "file2.txt", "dir/file 3\u00e9.txt"]
+            mock_cmd.assert_called_once_with(["git", "diff", "--name-only", "--cached", "-z"])
+    
+    def test_get_status_files(self):
+        """Test classifying files from porcelain v2 status output."""
+        with patch('py_opencommit.utils.git._run_git_command') as mock_cmd:
+            mock_result = MagicMock()
+            mock_result.stdout = "\0".join([
+                "1 M. N... 100644 100644 100644 abc abc staged.txt",
+                "1 .M N... 100644 100644 100644 abc abc unstaged.txt",
+                "1 MM N... 100644 100644 100644 abc abc both file.txt",
+                "2 R. N... 100644 100644 100644 abc abc R100 new.txt",
+                "old.txt",
+                "? untracked.txt",
+                "",
+            ])
+            mock_cmd.return_value = mock_result
+            
+            staged, unstaged, untracked = get_status_files()
+            assert staged == ["staged.txt", "both file.txt", "new.txt"]
+            assert unstaged == ["unstaged.txt", "both file.txt"]
+            assert untracked == ["untracked.txt"]
+            mock_cmd.assert_called_once_with(
+                ["git", "status", "--porcelain=v2", "-z", "--untracked-files=all"]
+            )
     
     def test_get_changed_files(self):
         """Test getting all changed files (staged and unstaged)."""
         with patch('py_opencommit.utils.git._run_git_command') as mock_cmd:
-            # Mock two different calls for staged and unstaged files
-            mock_cmd.side_effect = [
-                MagicMock(stdout="file1.txt\nfile2.txt\n"),  # staged
-                MagicMock(stdout="file2.txt\nfile3.txt\n")   # unstaged
-            ]
+            mock_cmd.return_value = MagicMock(stdout="\0".join([
+                "1 M. N... 100644 100644 100644 abc abc file1.txt",
+                "1 MM N... 100644 100644 100644 abc abc file2.txt",
+                "1 .M N... 100644 100644 100644 abc abc file3.txt",
+                "",
+            ]))
             
             result = get_changed_files()
             # Should combine and deduplicate
-            assert sorted(result) == ["file1.txt", "file2.txt", "file3.txt"]
-            assert mock_cmd.call_count == 2
+            assert result == ["file1.txt", "file2.txt", "file3.txt"]
+            mock_cmd.assert_called_once_with(
+                ["git", "status", "--porcelain=v2", "-z", "--untracked-files=no"]
+            )
     
     def test_get_staged_diff(self):
         """Test getting staged diff."""
@@ -173,25 +210,33 @@ class TestGitUtils:
                 get_staged_diff()
             assert "Failed to get staged diff" in str(excinfo.value)
     
-    def test_split_diff_by_files(self):
+    def test_get_staged_diff_truncated(self):
+        """Test that get_staged_diff stops reading at max_bytes on a line boundary."""
+        with patch('subprocess.Popen') as mock_popen:
+            proc = mock_popen.return_value
+            proc.stdout.read.return_value = b"line one\nline two\nline th"
+            proc.communicate.return_value = (b"", b"")
+            
+            result = get_staged_diff(max_bytes=20)
+            assert result == "line one\nline two\n# ... (diff truncated)\n"
+            proc.stdout.read.assert_called_once_with(21)
+            proc.kill.assert_called_once()
+    
+    def test_get_staged_diff_under_limit(self):
+        """Test that get_staged_diff returns the full diff when under max_bytes."""
+        with patch('subprocess.Popen') as mock_popen:
+            proc = mock_popen.return_value
+            proc.stdout.read.return_value = b"small diff\n"
+            proc.communicate.return_value = (b"", b"")
+            proc.returncode = 0
+            
+            result = get_staged_diff(max_bytes=100)
+            assert result == "small diff\n"
+            proc.kill.assert_not_called()
+    
+    def test_split_diff_by_files(self, staged_diff_text):
         """Test splitting a diff by files."""
-        test_diff = """diff --git a/file1.txt b/file1.txt
-index 1234567..abcdef 100644
---- a/file1.txt
-+++ b/file1.txt
-@@ -1,3 +1,4 @@
- line1
- line2
-+line3
-diff --git a/file2.txt b/file2.txt
-index 9876543..fedcba 100644
---- a/file2.txt
-+++ b/file2.txt
-@@ -1,2 +1 @@
--line1
- line2"""
-        
-        result = split_diff_by_files(test_diff)
+        result = split_diff_by_files(staged_diff_text)
         assert len(result) == 2
         assert "file1.txt" in result
         assert "file2.txt" in result
@@ -220,15 +265,30 @@ index 9876543..fedcba 100644
     
     def test_stage_files(self):
         """Test staging files."""
-        with patch('py_opencommit.utils.git._run_git_command') as mock_cmd:
+        with patch('py_opencommit.utils.git._run_git_command') as mock_cmd, \
+             patch('py_opencommit.utils.git.get_git_root', return_value='/fake/git/repo'):
             files = ["file1.txt", "file2.txt", "path/to/file3.txt"]
             stage_files(files)
             
-            # Updated assertion: expect one call per file
-            assert mock_cmd.call_count == len(files)
-            # Check that each file was added individually
-            expected_calls = [call(['git', 'add', f]) for f in files]
-            mock_cmd.assert_has_calls(expected_calls, any_order=True)
+            # All files are staged with a single git add, run from the repository root
+            mock_cmd.assert_called_once_with(['git', '-C', '/fake/git/repo', 'add', '--'] + files)
+    
+    def test_stage_files_from_subdirectory(self, tmp_path, monkeypatch):
+        """Test that root-relative paths from get_status_files stage from a subdirectory."""
+        subprocess.run(["git", "init", "-q", str(tmp_path)], check=True)
+        (tmp_path / "top.txt").write_text("top\n")
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / "nested.txt").write_text("nested\n")
+        monkeypatch.chdir(tmp_path / "sub")
+        
+        _, _, untracked = get_status_files()
+        assert sorted(untracked) == ["sub/nested.txt", "top.txt"]
+        
+        stage_files(untracked)
+        
+        staged, _, untracked = get_status_files()
+        assert sorted(staged) == ["sub/nested.txt", "top.txt"]
+        assert untracked == []
     
     def test_stage_files_empty(self):
         """Test staging with empty file list."""
@@ -268,6 +328,18 @@ index 9876543..fedcba 100644
             
             assert "Failed to stage all changes" in str(excinfo.value)
     
+    def test_stage_all_if_needed(self):
+        """Test that stage_all_if_needed only runs `git add` for a dirty worktree."""
+        with patch('py_opencommit.utils.git.get_status_files') as mock_status, \
+             patch('py_opencommit.utils.git.stage_all_changes') as mock_stage:
+            mock_status.return_value = (["staged.txt"], [], [])
+            assert stage_all_if_needed() is False
+            mock_stage.assert_not_called()
+
+            mock_status.return_value = ([], [], ["new.txt"])
+            assert stage_all_if_needed() is True
+            mock_stage.assert_called_once()
+    
     def test_get_commit_template(self):
         """Test getting commit template."""
         with patch('py_opencommit.utils.git._run_git_command') as mock_cmd, \
@@ -347,14 +419,26 @@ index 9876543..fedcba 100644
     
     def test_get_repo_status(self):
         """Test getting repository status."""
-        with patch('py_opencommit.utils.git.has_staged_changes', return_value=True), \
-             patch('py_opencommit.utils.git.has_unstaged_changes', return_value=False), \
-             patch('py_opencommit.utils.git.get_git_root', return_value="/path/to/repo"):
+        with patch('py_opencommit.utils.git._run_git_command') as mock_cmd:
+            mock_cmd.return_value = MagicMock(
+                stdout="1 M. N... 100644 100644 100644 abc abc staged.txt\0"
+            )
             
             status = get_repo_status()
             assert status["has_staged_changes"] is True
             assert status["has_unstaged_changes"] is False
             assert status["is_git_repo"] is True
+            mock_cmd.assert_called_once()
+    
+    def test_get_repo_status_outside_repo(self):
+        """Test repository status outside a git repository."""
+        with patch('py_opencommit.utils.git._run_git_command', side_effect=GitError("not a git repository")):
+            status = get_repo_status()
+            assert status == {
+                "has_staged_changes": False,
+                "has_unstaged_changes": False,
+                "is_git_repo": False,
+            }
     
     def test_commit(self):
         """Test committing changes."""
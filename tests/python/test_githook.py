@@ -8,7 +8,9 @@ from pathlib import Path
 from unittest.mock import patch, MagicMock
 import pytest
 
-from py_opencommit.commands.githook import githook, HOOK_CONTENT
+from py_opencommit.commands.githook import githook, load_hook_content
+
+HOOK_CONTENT = load_hook_content()
 
 
 def test_githook_not_in_git_repo():
@@ -111,6 +113,22 @@ def test_githook_overwrite_existing():
                     assert "Existing hook" not in content
 
 
+@pytest.mark.skipif(platform.system() == 'Windows', reason="POSIX permissions only")
+def test_githook_installs_atomically_with_shared_mode():
+    """Test the hook is renamed into place with rwxr-xr-x permissions."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        hooks_dir = Path(temp_dir) / '.git' / 'hooks'
+        hooks_dir.mkdir(parents=True, exist_ok=True)
+
+        with patch('py_opencommit.commands.githook.get_git_root', return_value=temp_dir):
+            with patch('py_opencommit.commands.githook.console'):
+                assert githook() is True
+
+        hook_path = hooks_dir / 'prepare-commit-msg'
+        assert stat.S_IMODE(os.stat(hook_path).st_mode) == 0o755
+        assert not (hooks_dir / 'prepare-commit-msg.tmp').exists()
+
+
 def test_hook_functionality_parsing():
     """Test the hook script's logic and structure instead of execution."""
     # Since executing the hook script is challenging in a test environment,
@@ -124,7 +142,12 @@ def test_hook_functionality_parsing():
     assert "if commit_msg.startswith('Merge')" in HOOK_CONTENT
     assert "sys.exit(0)" in HOOK_CONTENT
     
-    # Check if it executes oco command
+    # Check if it generates the message in-process when the package is importable
+    assert "from py_opencommit.commands.commit import generate_commit_message" in HOOK_CONTENT
+    assert "get_staged_diff(MAX_DIFF_BYTES)" in HOOK_CONTENT
+    assert "except ImportError:" in HOOK_CONTENT
+    
+    # Check if it falls back to executing the oco command
     assert "['oco', 'commit'" in HOOK_CONTENT
     assert "subprocess.run" in HOOK_CONTENT
     
@@ -171,3 +194,20 @@ def test_hook_script_handles_merge_commit():
             
             # Verify subprocess.run was not called (since it's a merge commit)
             mock_run.assert_not_called()
+
+
+def test_githook_skips_unchanged_hook():
+    """Test githook doesn't rewrite a hook that is already up to date."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        hooks_dir = Path(temp_dir) / '.git' / 'hooks'
+        hooks_dir.mkdir(parents=True, exist_ok=True)
+        
+        with patch('py_opencommit.commands.githook.get_git_root', return_value=temp_dir):
+            with patch('py_opencommit.commands.githook.console'):
+                assert githook() is True
+                
+                hook_path = hooks_dir / 'prepare-commit-msg'
+                before = os.stat(hook_path)
+                assert githook() is True
+                after = os.stat(hook_path)
+                assert (after.st_ino, after.st_mtime_ns) == (before.st_ino, before.st_mtime_ns)
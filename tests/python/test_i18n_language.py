@@ -0,0 +1,41 @@
+"""Tests for selecting the i18n language."""
+
+from unittest.mock import patch
+
+import pytest
+
+from py_opencommit.i18n import get_text, set_language
+
+
+@pytest.fixture(autouse=True)
+def reset_language(monkeypatch):
+    """Run each test with PYOC_LANGUAGE unset and English as the current language."""
+    monkeypatch.delenv("PYOC_LANGUAGE", raising=False)
+    set_language("en")
+    yield
+    set_language("en")
+
+
+def test_set_language():
+    """Test overriding the current language."""
+    with patch('py_opencommit.i18n._load', return_value={}) as mock_load:
+        set_language("es")
+        get_text("localLanguage")
+        mock_load.assert_called_with("es")
+
+    set_language("unknown_language")
+    # Unknown languages fall back to English
+    assert get_text("localLanguage") == "english"
+
+
+def test_env_language_overrides_current_language(monkeypatch):
+    """Test that PYOC_LANGUAGE set after import still takes precedence."""
+    set_language("en")
+    monkeypatch.setenv("PYOC_LANGUAGE", "es")
+    with patch('py_opencommit.i18n._load', return_value={}) as mock_load:
+        get_text("localLanguage")
+        mock_load.assert_called_with("es")
+
+        # An explicit language still wins over the environment
+        get_text("localLanguage", "en")
+        mock_load.assert_called_with("en")
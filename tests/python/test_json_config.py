@@ -0,0 +1,54 @@
+"""Tests for the JSON config file module."""
+
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+from py_opencommit import config as json_config
+
+
+@pytest.fixture
+def config_dir(tmp_path):
+    """Point the JSON config at a temporary directory with an empty cache."""
+    json_config._CACHE.update(stamp=None, data=None)
+    with patch('py_opencommit.config.get_config_dir', return_value=tmp_path):
+        yield tmp_path
+    json_config._CACHE.update(stamp=None, data=None)
+
+
+def test_get_config_missing_file(config_dir):
+    """Test that a missing config file yields an empty config."""
+    assert json_config.get_config() == {}
+
+
+@pytest.mark.parametrize("content", [b"{not json", b'{"model": "\xff"}'])
+def test_get_config_malformed_file(config_dir, content):
+    """Test that an invalid or non-UTF-8 config file yields an empty config."""
+    (config_dir / "config.json").write_bytes(content)
+    assert json_config.get_config() == {}
+
+
+def test_get_config_returns_copies(config_dir):
+    """Test that mutating a returned config doesn't change the cached one."""
+    (config_dir / "config.json").write_text(json.dumps({"model": "gpt-4"}))
+
+    first = json_config.get_config()
+    first["model"] = "changed"
+
+    assert json_config.get_config() == {"model": "gpt-4"}
+
+
+def test_get_config_rereads_same_mtime_rewrite(config_dir):
+    """Test that a rewrite with an unchanged mtime but new size is picked up."""
+    config_path = config_dir / "config.json"
+    config_path.write_text(json.dumps({"model": "gpt-4"}))
+    assert json_config.get_config() == {"model": "gpt-4"}
+
+    stat = config_path.stat()
+    config_path.write_text(json.dumps({"model": "gpt-4o-mini"}))
+    # Simulate a rewrite within the filesystem's timestamp granularity
+    os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert json_config.get_config() == {"model": "gpt-4o-mini"}
@@ -0,0 +1,26 @@
+"""Tests for token counting utilities."""
+
+from unittest.mock import MagicMock, patch
+
+from py_opencommit.utils import token_count as token_count_module
+from py_opencommit.utils.token_count import MAX_CACHED_CHARS, token_count
+
+
+def test_token_count_caches_only_small_inputs():
+    """Test that small strings are cached and large ones are always re-counted."""
+    encoding = MagicMock()
+    encoding.encode.side_effect = lambda text: [0] * len(text.split())
+    token_count_module._cached_count.cache_clear()
+
+    with patch('py_opencommit.utils.token_count.tiktoken.get_encoding', return_value=encoding):
+        assert token_count("a b c") == 3
+        assert token_count("a b c") == 3
+        assert encoding.encode.call_count == 1
+
+        large = "x " * MAX_CACHED_CHARS
+        assert token_count(large) == MAX_CACHED_CHARS
+        assert token_count(large) == MAX_CACHED_CHARS
+        assert encoding.encode.call_count == 3
+
+    assert token_count_module._cached_count.cache_info().currsize == 1
+    token_count_module._cached_count.cache_clear()